@@ -9,7 +9,40 @@ class Settings(BaseSettings):
     
     WEATHER_LAB_API_URL: str = "https://weather-lab-data-api-production.up.railway.app"
     RISK_RADIUS_KM: float = 160.9  # 100 miles in kilometers
+    DISTANCE_MEMO_PRECISION_DEG: float = 0.01  # Storm position quantization for distance reuse (0 = exact)
+    DISTANCE_MEMO_MAX_ENTRIES: int = 50_000
     LOG_LEVEL: str = "INFO"
+    TRAVEL_CALENDAR_PATH: str = ""  # Optional JSON file with holiday and per-airport seasonal multipliers
+    CACHE_MAX_AGE_SECONDS: int = 60  # Cache-Control max-age for analysis responses
+    SUBSCRIPTION_POLL_SECONDS: float = 60.0  # Upstream poll interval per subscribed window
+    SUBSCRIPTION_KEEPALIVE_SECONDS: float = 15.0  # Idle SSE keepalive interval
+    SUBSCRIPTION_MAX_WINDOWS: int = 32  # Distinct subscribed windows (upstream pollers) per worker
+    CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "sqlite" (shared by workers on a host)
+    CACHE_PATH: str = "/tmp/hurricane-risk-api/cache.sqlite3"
+    CACHE_VERSION: str = "1"  # Bump to invalidate entries written by older releases
+    CACHE_TTL_SECONDS: float = 300.0
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # SQLite backend only
+    UPSTREAM_CACHE_TTL_SECONDS: float = 60.0  # 0 disables caching of weather-lab-data-api responses
+    SNAPSHOT_TTL_SECONDS: float = 86400.0  # How long result snapshots stay available for deltas
+    JOB_STORE_PATH: str = "/tmp/hurricane-risk-api/jobs.sqlite3"
+    JOB_WORKERS: int = 1  # Background analysis processes per API worker
+    JOB_MAX_PENDING: int = 16  # Queued + running jobs per API worker before 429
+    JOB_RESULT_TTL_SECONDS: float = 86400.0
+    JOB_STORE_MAX_ENTRIES: int = 10_000
+    JOB_STORE_MAX_BYTES: int = 256 * 1024 * 1024
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024  # Smaller responses are sent uncompressed
+    MAX_REQUEST_BODY_BYTES: int = 64 * 1024 * 1024  # Limit on (decompressed) request bodies
+    PROFILING_TOKEN: str = ""  # Operator secret sent as X-Profile-Token to profile a request (empty disables)
+    PROFILE_DIR: str = "/tmp/hurricane-risk-api/profiles"
+    PROFILE_MAX_FILES: int = 50
+    # Admission control; cost = days x records per day x airports (distance evaluations)
+    ADMISSION_MAX_INFLIGHT_COST: float = 2_000_000
+    ADMISSION_INTERACTIVE_COST: float = 50_000  # Requests up to this cost use the priority lane
+    ADMISSION_INTERACTIVE_QUEUE: int = 64
+    ADMISSION_BULK_QUEUE: int = 8
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 10.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,175 @@
+"""
+Open-loop load generator for the Hurricane Risk API
+
+Fires requests at a fixed target rate regardless of how quickly responses
+come back (so a slow server shows up as growing latency rather than a lower
+offered load), then reports throughput and latency percentiles.
+
+Example:
+    python -m loadtest.load_generator --base-url http://localhost:8000 \
+        --endpoint analyze-records --rps 20 --duration 30 --days 7 --records-per-day 200
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+import httpx
+
+from loadtest.stub_server import generate_records
+
+ENDPOINTS = ("analyze", "analyze-range", "analyze-records", "health")
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run."""
+    latencies_ms: List[float] = field(default_factory=list)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    elapsed_s: float = 0.0
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies_ms)
+
+    def summary(self) -> Dict[str, Any]:
+        """Throughput and latency percentiles as a JSON-friendly dict."""
+        ok = sum(count for status, count in self.status_codes.items() if 200 <= status < 400)
+        return {
+            "requests": self.completed,
+            "ok": ok,
+            "status_codes": {str(status): count for status, count in sorted(self.status_codes.items())},
+            "errors": dict(self.errors),
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput_rps": round(self.completed / self.elapsed_s, 2) if self.elapsed_s else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(self.latencies_ms, 50), 2),
+                "p95": round(percentile(self.latencies_ms, 95), 2),
+                "p99": round(percentile(self.latencies_ms, 99), 2),
+                "max": round(max(self.latencies_ms), 2) if self.latencies_ms else 0.0,
+            },
+        }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile (0 for an empty sample)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def build_request(endpoint: str, start_date: str, days: int, records_per_day: int) -> Dict[str, Any]:
+    """Build the method, path and JSON body for one request."""
+    if endpoint == "health":
+        return {"method": "GET", "url": "/api/v1/health"}
+    if endpoint == "analyze":
+        return {"method": "POST", "url": "/api/v1/analyze", "json": {"date": start_date, "days": days}}
+    if endpoint == "analyze-range":
+        return {"method": "POST", "url": "/api/v1/analyze-range", "json": {"start_date": start_date, "days": days}}
+    if endpoint == "analyze-records":
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        data = {}
+        for offset in range(days):
+            date = (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+            data[date] = {"records": generate_records(date, records_per_day)}
+        return {
+            "method": "POST",
+            "url": "/api/v1/analyze-records",
+            "json": {"start_date": start_date, "days": days, "data": data},
+        }
+    raise ValueError(f"Unknown endpoint {endpoint!r}; expected one of {ENDPOINTS}")
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    request: Dict[str, Any],
+    rps: float,
+    duration_s: float,
+    max_in_flight: Optional[int] = None
+) -> LoadResult:
+    """
+    Drive ``request`` at ``rps`` for ``duration_s`` seconds.
+
+    Args:
+        client: HTTP client pointed at the API under test
+        request: Keyword arguments for ``client.request``
+        rps: Target requests per second
+        duration_s: How long to keep issuing requests
+        max_in_flight: Optional cap on concurrent requests (unbounded by default)
+
+    Returns:
+        Collected latencies and status codes
+    """
+    result = LoadResult()
+    limit = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+    total = max(1, int(rps * duration_s))
+    interval = 1.0 / rps
+
+    async def one() -> None:
+        if limit:
+            await limit.acquire()
+        started = time.perf_counter()
+        try:
+            response = await client.request(**request)
+            result.status_codes[response.status_code] += 1
+        except httpx.HTTPError as e:
+            result.errors[type(e).__name__] += 1
+        finally:
+            result.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            if limit:
+                limit.release()
+
+    begin = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        # Schedule against the start time so slow sends do not drift the rate
+        delay = begin + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one()))
+    await asyncio.gather(*tasks)
+    result.elapsed_s = time.perf_counter() - begin
+    return result
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    request = build_request(args.endpoint, args.start_date, args.days, args.records_per_day)
+    if "json" in request:
+        # Serialize once so body encoding does not count against the client
+        request["content"] = json.dumps(request.pop("json")).encode("utf-8")
+        request["headers"] = {"Content-Type": "application/json"}
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        result = await run_load(client, request, args.rps, args.duration, args.max_in_flight)
+    return result.summary()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the Hurricane Risk API")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="analyze-range")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--start-date", default="2024-10-23")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--records-per-day", type=int, default=24, help="Body size for analyze-records")
+    parser.add_argument("--connections", type=int, default=100, help="HTTP connection pool size")
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_main(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Local stand-in for weather-lab-data-api used for load testing
+
+Serves `/data` and `/data-range` with synthetic hurricane tracks. Payload size,
+latency and error rate are configurable so pooling, caching and executor
+changes can be exercised without touching the real service.
+
+Run with:
+    STUB_RECORDS_PER_DAY=200 STUB_LATENCY_MS=150 uvicorn loadtest.stub_server:app --port 9000
+or:
+    python -m loadtest.stub_server --port 9000 --records-per-day 200 --latency-ms 150
+"""
+import argparse
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from fastapi import FastAPI, HTTPException, Query
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server."""
+    records_per_day: int = 24
+    storms: int = 2
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 42
+
+    @classmethod
+    def from_env(cls) -> "StubConfig":
+        """Read the configuration from STUB_* environment variables."""
+        return cls(
+            records_per_day=int(os.getenv("STUB_RECORDS_PER_DAY", cls.records_per_day)),
+            storms=int(os.getenv("STUB_STORMS", cls.storms)),
+            latency_ms=float(os.getenv("STUB_LATENCY_MS", cls.latency_ms)),
+            jitter_ms=float(os.getenv("STUB_JITTER_MS", cls.jitter_ms)),
+            error_rate=float(os.getenv("STUB_ERROR_RATE", cls.error_rate)),
+            seed=int(os.getenv("STUB_SEED", cls.seed)),
+        )
+
+
+def generate_records(date: str, records_per_day: int, storms: int = 2, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Build deterministic synthetic track records for one day.
+
+    Storms start in the Caribbean and drift north-west towards Florida and the
+    US East Coast, so a realistic share of airports ends up at risk.
+
+    Args:
+        date: Date in YYYY-MM-DD format
+        records_per_day: Number of records to produce
+        storms: Number of distinct track IDs to spread the records over
+        seed: Seed for reproducible tracks
+
+    Returns:
+        List of weather-lab-data-api style records
+    """
+    day = datetime.strptime(date, "%Y-%m-%d")
+    day_index = day.toordinal()
+    rng = random.Random(f"{seed}:{date}")
+    storms = max(1, storms)
+    records = []
+    for i in range(records_per_day):
+        storm = i % storms
+        step = i // storms
+        per_storm = max(1, records_per_day // storms)
+        valid_time = day + timedelta(hours=24 * step / per_storm)
+        progress = (day_index % 10) + step / per_storm
+        records.append({
+            "track_id": f"AL{10 + storm:02d}{day.year}",
+            "ensemble_member": step % 50,
+            "valid_time": valid_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "lat": round(15.0 + 2.0 * storm + 1.5 * progress + rng.uniform(-0.5, 0.5), 3),
+            "lon": round(-62.0 - 3.0 * storm - 2.0 * progress + rng.uniform(-0.5, 0.5), 3),
+            "maximum_sustained_wind_speed_knots": round(rng.uniform(35, 140), 1),
+        })
+    return records
+
+
+def create_stub_app(config: Optional[StubConfig] = None) -> FastAPI:
+    """Create the stub weather-lab-data-api application."""
+    config = config or StubConfig.from_env()
+    rng = random.Random(config.seed)
+    stub = FastAPI(title="weather-lab-data-api stub")
+
+    async def simulate_upstream() -> None:
+        """Apply injected latency and errors."""
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+        if config.error_rate > 0 and rng.random() < config.error_rate:
+            raise HTTPException(status_code=503, detail="Injected upstream error")
+
+    @stub.get("/data")
+    async def data(date: str = Query(...)) -> Dict[str, Any]:
+        await simulate_upstream()
+        records = generate_records(date, config.records_per_day, config.storms, config.seed)
+        return {
+            "meta": {"date": date, "total_records": len(records)},
+            "records": records,
+        }
+
+    @stub.get("/data-range")
+    async def data_range(start: str = Query(...), days: int = Query(..., ge=1)) -> Dict[str, Any]:
+        await simulate_upstream()
+        start_day = datetime.strptime(start, "%Y-%m-%d")
+        data = {}
+        for offset in range(days):
+            date = (start_day + timedelta(days=offset)).strftime("%Y-%m-%d")
+            data[date] = {"records": generate_records(date, config.records_per_day, config.storms, config.seed)}
+        return {
+            "meta": {
+                "start_date": start,
+                "days": days,
+                "total_records": config.records_per_day * days,
+            },
+            "data": data,
+        }
+
+    @stub.get("/health")
+    async def health() -> Dict[str, str]:
+        return {"status": "ok", "service": "weather-lab-data-api-stub"}
+
+    return stub
+
+
+app = create_stub_app()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the weather-lab-data-api stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--records-per-day", type=int, default=StubConfig.records_per_day)
+    parser.add_argument("--storms", type=int, default=StubConfig.storms)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=StubConfig.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+    parser.add_argument("--seed", type=int, default=StubConfig.seed)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        records_per_day=args.records_per_day,
+        storms=args.storms,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_stub_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
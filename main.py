@@ -1,14 +1,30 @@
 """
 Hurricane Risk API - FastAPI application
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import risk
+from routers import risk, subscriptions, jobs, profiles
+from services.subscriptions import subscription_hub
+from services.jobs import shutdown_job_manager
+from services.wire_format import WireFormatMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    yield
+    # Stop background subscription pollers and job workers
+    await subscription_hub.close()
+    shutdown_job_manager()
+
 
 app = FastAPI(
     title="Hurricane Risk API",
     description="API for calculating traveler risk exposure from hurricane impacts",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -20,8 +36,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Negotiate MessagePack/CBOR bodies and gzip/zstd compression
+app.add_middleware(WireFormatMiddleware)
+
 # Include routers
 app.include_router(risk.router, prefix="/api/v1", tags=["risk"])
+app.include_router(subscriptions.router, prefix="/api/v1", tags=["subscriptions"])
+app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
+app.include_router(profiles.router, prefix="/api/v1", tags=["profiles"])
 
 
 @app.get("/")
@@ -1,21 +1,89 @@
 """Request models for Hurricane Risk API"""
-from pydantic import BaseModel, Field
-from typing import Dict, List, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Any, Optional
 
+SUPPORTED_RESOLUTIONS_HOURS = (1, 3, 6, 12, 24)
+MAX_RADII = 10
+MAX_RADIUS_KM = 1000.0
 
-class RiskAnalysisRequest(BaseModel):
+
+class AnalysisOptionsMixin(BaseModel):
+    """Optional analysis settings shared by analysis requests."""
+    resolution_hours: int = Field(
+        default=24,
+        description="Exposure window size in hours (1, 3, 6, 12 or 24 for daily only)"
+    )
+    radii_km: Optional[List[float]] = Field(
+        default=None,
+        description="Additional exposure radii in km, reported in exposure_by_radius"
+    )
+    risk_breakpoints_km: Optional[List[float]] = Field(
+        default=None,
+        description="[high, medium] distance thresholds in km for risk_level (default [50, 100])"
+    )
+    include_storm_breakdown: bool = Field(
+        default=False,
+        description="Add per-storm (track_id) exposure to each daily profile"
+    )
+    
+    @field_validator('resolution_hours')
+    @classmethod
+    def validate_resolution(cls, value: int) -> int:
+        if value not in SUPPORTED_RESOLUTIONS_HOURS:
+            raise ValueError(f"resolution_hours must be one of {SUPPORTED_RESOLUTIONS_HOURS}")
+        return value
+    
+    @field_validator('radii_km')
+    @classmethod
+    def validate_radii(cls, value: Optional[List[float]]) -> Optional[List[float]]:
+        if value is None:
+            return value
+        if not 1 <= len(value) <= MAX_RADII:
+            raise ValueError(f"radii_km must contain 1 to {MAX_RADII} values")
+        if any(radius <= 0 or radius > MAX_RADIUS_KM for radius in value):
+            raise ValueError(f"radii_km values must be in (0, {MAX_RADIUS_KM}]")
+        return sorted(set(value))
+    
+    @field_validator('risk_breakpoints_km')
+    @classmethod
+    def validate_breakpoints(cls, value: Optional[List[float]]) -> Optional[List[float]]:
+        if value is None:
+            return value
+        if len(value) != 2 or not 0 < value[0] < value[1]:
+            raise ValueError("risk_breakpoints_km must be [high, medium] with 0 < high < medium")
+        return value
+    
+    def analysis_options(self) -> Dict[str, Any]:
+        """Keyword arguments for RiskCalculator.calculate_risk_profile."""
+        return {
+            'resolution_hours': self.resolution_hours,
+            'radii_km': self.radii_km,
+            'risk_breakpoints_km': self.risk_breakpoints_km,
+            'storm_breakdown': self.include_storm_breakdown,
+        }
+
+
+class DeltaRequestMixin(BaseModel):
+    """Delta responses for the synchronous analyze endpoints."""
+    previous_token: Optional[str] = Field(
+        default=None,
+        description="meta.result_token of an earlier response; returns only per-day changes since it"
+    )
+
+
+class RiskAnalysisRequest(AnalysisOptionsMixin, DeltaRequestMixin):
     """Request for single date risk analysis."""
     date: str = Field(..., description="Date in YYYY-MM-DD format")
     days: int = Field(default=1, description="Number of days to analyze")
 
 
-class RiskAnalysisRangeRequest(BaseModel):
+class RiskAnalysisRangeRequest(AnalysisOptionsMixin, DeltaRequestMixin):
     """Request for date range risk analysis."""
     start_date: str = Field(..., description="Start date in YYYY-MM-DD format")
     days: int = Field(..., ge=1, le=30, description="Number of days to forecast (1-30)")
 
 
-class RiskAnalysisWithDataRequest(BaseModel):
+class RiskAnalysisWithDataRequest(AnalysisOptionsMixin, DeltaRequestMixin):
     """Request for risk analysis with provided weather data."""
     start_date: str = Field(..., description="Start date in YYYY-MM-DD format")
     days: int = Field(..., ge=1, le=30, description="Number of days to analyze (1-30)")
@@ -23,3 +91,13 @@ class RiskAnalysisWithDataRequest(BaseModel):
         ..., 
         description="Weather data structure: {date: {records: [...]}, ...}"
     )
+
+
+class RiskAnalysisJobRequest(AnalysisOptionsMixin):
+    """Request for a background risk analysis job."""
+    start_date: str = Field(..., description="Start date in YYYY-MM-DD format")
+    days: int = Field(..., ge=1, le=366, description="Number of days to analyze (1-366)")
+    data: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]] = Field(
+        default=None,
+        description="Optional weather data ({date: {records: [...]}}); fetched from weather-lab-data-api when omitted"
+    )
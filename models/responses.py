@@ -1,6 +1,6 @@
 """Response models for Hurricane Risk API"""
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Dict
 
 
 class AirportRisk(BaseModel):
@@ -12,16 +12,72 @@ class AirportRisk(BaseModel):
     risk_level: str  # "high", "medium", "low"
 
 
+class StormExposure(BaseModel):
+    """Exposure attributable to one storm (track_id) on a date."""
+    track_id: Optional[str]
+    closest_approach_km: float
+    closest_airport: str
+    total_travelers_at_risk: int
+    airports_affected: int
+    airport_codes: List[str]
+
+
+class RadiusExposure(BaseModel):
+    """Exposure within one of the requested radii."""
+    radius_km: float
+    total_travelers_at_risk: int
+    airports_affected: int
+    airports_at_risk: List[AirportRisk]
+
+
+class TimeWindowRisk(BaseModel):
+    """Risk profile for a sub-daily window (UTC, end exclusive)."""
+    window_start: str
+    window_end: str
+    total_travelers_at_risk: int
+    airports_affected: int
+    airports_at_risk: List[AirportRisk]
+    active_hurricanes: int
+
+
 class DailyRiskProfile(BaseModel):
     """Daily risk profile for a specific date."""
     date: str
     total_travelers_at_risk: int
     airports_affected: int
     airports_at_risk: List[AirportRisk]
-    active_hurricanes: int
+    active_hurricanes: int  # distinct storms (track_id)
+    time_windows: Optional[List[TimeWindowRisk]] = None
+    exposure_by_radius: Optional[List[RadiusExposure]] = None
+    storms: Optional[List[StormExposure]] = None
+
+
+class DailyRiskDelta(BaseModel):
+    """Airport changes for one date relative to a previous result."""
+    date: str
+    added: List[AirportRisk]
+    removed: List[str]  # airport codes no longer at risk
+    changed: List[AirportRisk]
+    total_travelers_at_risk: int
 
 
 class RiskAnalysisResponse(BaseModel):
     """Response for risk analysis."""
     meta: dict
     daily_risk: List[DailyRiskProfile]
+    daily_delta: Optional[List[DailyRiskDelta]] = None
+
+
+class JobStatus(BaseModel):
+    """Status of a background analysis job."""
+    job_id: str
+    status: str  # "queued", "running", "succeeded", "failed"
+    submitted_at: str
+    start_date: str
+    days: int
+    progress: Dict[str, int]
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    status_url: Optional[str] = None
+    result_url: Optional[str] = None
@@ -0,0 +1,82 @@
+"""
+Background job API for long-running risk analyses
+"""
+from fastapi import APIRouter, HTTPException, Request
+
+from models.requests import RiskAnalysisJobRequest
+from models.responses import JobStatus, RiskAnalysisResponse
+from services.jobs import JobQueueFull, get_job_manager
+from core.config import settings
+
+router = APIRouter()
+
+
+def _with_links(job: dict, request: Request) -> JobStatus:
+    """Attach status and result URLs to a job record."""
+    status_url = str(request.url_for("get_job", job_id=job['job_id']))
+    return JobStatus(
+        **job,
+        status_url=status_url,
+        result_url=status_url + "/result"
+    )
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202, response_model_exclude_none=True)
+def submit_job(request: RiskAnalysisJobRequest, http_request: Request) -> JobStatus:
+    """
+    Submit a risk analysis to run in the background.
+
+    Use this for season-scale windows (up to 366 days) or analyses that would
+    exceed HTTP timeouts. The response returns immediately with a job ID;
+    poll `status_url` and fetch `result_url` once the job has succeeded.
+
+    Job routes are plain functions so FastAPI runs them in the threadpool:
+    the SQLite job store can wait on the write lock held by job processes.
+
+    Args:
+        request: Analysis window, options and optional weather data
+
+    Returns:
+        Job status (202 Accepted)
+    """
+    try:
+        job = get_job_manager().submit(
+            request.start_date,
+            request.days,
+            request.analysis_options(),
+            data=request.data
+        )
+    except JobQueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={'Retry-After': str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+        )
+    return _with_links(job, http_request)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus, response_model_exclude_none=True)
+def get_job(job_id: str, http_request: Request) -> JobStatus:
+    """Get the status and progress of a job."""
+    job = get_job_manager().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return _with_links(job, http_request)
+
+
+@router.get("/jobs/{job_id}/result", response_model=RiskAnalysisResponse, response_model_exclude_unset=True)
+def get_job_result(job_id: str) -> RiskAnalysisResponse:
+    """Get the result of a succeeded job."""
+    manager = get_job_manager()
+    job = manager.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=500, detail=job.get('error') or "Job failed")
+    if job['status'] != 'succeeded':
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    result = manager.store.get_result(job_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job result expired")
+    return RiskAnalysisResponse(**result)
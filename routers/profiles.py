@@ -0,0 +1,30 @@
+"""
+Download endpoint for request profiles (operators only)
+"""
+import os
+import re
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from services.profiling import PROFILE_HEADER, profile_path, profiling_requested
+
+router = APIRouter()
+
+_PROFILE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+@router.get("/profiles/{profile_id}", include_in_schema=False)
+async def get_profile(profile_id: str, http_request: Request) -> FileResponse:
+    """
+    Download a request profile as a pstats file.
+
+    Requires the same X-Profile-Token header as the profiled request. Load it
+    with ``pstats.Stats`` or a viewer such as snakeviz or flameprof.
+    """
+    if not profiling_requested(http_request.headers.get(PROFILE_HEADER)):
+        raise HTTPException(status_code=404, detail="Not Found")
+    path = profile_path(profile_id) if _PROFILE_ID.match(profile_id) else None
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found or expired")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
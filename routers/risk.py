@@ -1,14 +1,21 @@
 """
 Risk calculation API endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 
 from models.requests import RiskAnalysisRequest, RiskAnalysisRangeRequest, RiskAnalysisWithDataRequest
-from models.responses import RiskAnalysisResponse, DailyRiskProfile, AirportRisk
+from models.responses import RiskAnalysisResponse, DailyRiskProfile, DailyRiskDelta, AirportRisk
 from services.data_client import WeatherLabClient
 from services.risk_calculator import RiskCalculator
+from services.etag import compute_etag, etag_matches, cache_headers
+from services.cache import get_cache
+from services.admission import AdmissionRejected, admission_controller, estimate_cost
+from services.profiling import PROFILE_HEADER, RequestProfile, profiling_requested
+from services.delta import result_token, delta_etag, store_snapshot, load_snapshot, build_snapshot, diff_snapshots
+from core.airports import MAJOR_AIRPORTS
 from core.config import settings
 
 router = APIRouter()
@@ -23,6 +30,157 @@ async def get_weather_client() -> WeatherLabClient:
         await client.close()
 
 
+def _not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the caching headers."""
+    return Response(status_code=304, headers=cache_headers(etag, settings.CACHE_MAX_AGE_SECONDS))
+
+
+def _count_records(hurricane_data: dict, start_date: str, days: int) -> int:
+    """Count hurricane records inside the analysis window."""
+    data_by_date = hurricane_data.get('data', {}) or {}
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    return sum(
+        len((data_by_date.get((start + timedelta(days=i)).strftime('%Y-%m-%d')) or {}).get('records', []) or [])
+        for i in range(days)
+    )
+
+
+async def _calculate_risk_profile(etag: str, hurricane_data: dict, start_date: str, days: int,
+                                  profile: Optional[RequestProfile] = None,
+                                  **options: Any) -> Dict[str, Any]:
+    """
+    Run the risk calculation, reusing a cached result for identical inputs.
+    
+    The ETag already covers every input of the calculation, so it doubles as
+    the result cache key (shared across workers with the SQLite backend).
+    Cache misses go through admission control and run in the threadpool so
+    heavy analyses never block the event loop for cheap requests; counting
+    records for the cost estimate runs there too.
+    Profiled requests skip the cache lookup so the calculation always runs
+    under the profiler.
+    
+    Raises:
+        HTTPException: 429/503 with Retry-After when over the admission budget
+    """
+    cache = get_cache()
+    key = f"result:{etag}"
+    result = await cache.aget(key) if profile is None else None
+    if result is not None:
+        return result
+    
+    records = await run_in_threadpool(_count_records, hurricane_data, start_date, days)
+    cost = estimate_cost(days, records, len(MAJOR_AIRPORTS))
+    try:
+        async with admission_controller.admit(cost):
+            calculator = RiskCalculator()
+            if profile is None:
+                result = await run_in_threadpool(
+                    calculator.calculate_risk_profile, hurricane_data, start_date, days, **options
+                )
+            else:
+                result = await run_in_threadpool(
+                    profile.runcall, calculator.calculate_risk_profile,
+                    hurricane_data, start_date, days, timer=profile, **options
+                )
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={'Retry-After': str(e.retry_after)}
+        )
+    
+    await cache.aset(key, result)
+    return result
+
+
+async def _analyze(
+    request: Union[RiskAnalysisRequest, RiskAnalysisRangeRequest, RiskAnalysisWithDataRequest],
+    hurricane_data: dict,
+    start_date: str,
+    http_request: Request,
+    http_response: Response,
+    **extra_meta: Any
+):
+    """
+    Shared analysis flow for the analyze endpoints.
+    
+    Computes the input ETag (answering 304 when it matches If-None-Match),
+    runs or reuses the calculation, snapshots the result for later deltas
+    and builds the full or delta response. With a valid profile token the
+    request is profiled instead of answered from caches.
+    
+    Returns:
+        RiskAnalysisResponse, or a bare 304 Response
+    """
+    options = request.analysis_options()
+    profile = RequestProfile() if profiling_requested(http_request.headers.get(PROFILE_HEADER)) else None
+    # Hashing canonicalizes every record: keep it off the event loop
+    etag = await run_in_threadpool(
+        compute_etag, hurricane_data, start_date, request.days, settings.RISK_RADIUS_KM, **options
+    )
+    token = result_token(etag)
+    previous_token = request.previous_token
+    response_etag = delta_etag(etag, previous_token) if previous_token else etag
+    
+    # Unchanged inputs produce an unchanged result: skip the computation
+    if profile is None and etag_matches(http_request.headers.get('if-none-match'), response_etag):
+        return _not_modified(response_etag)
+    
+    # Calculate risk profile
+    result = await _calculate_risk_profile(
+        etag, hurricane_data, start_date, request.days, profile=profile, **options
+    )
+    await store_snapshot(token, result['daily_risk'])
+    
+    # Build response
+    end_date = (datetime.strptime(start_date, '%Y-%m-%d') + 
+               timedelta(days=request.days-1)).strftime('%Y-%m-%d')
+    meta = {
+        'start_date': start_date,
+        'end_date': end_date,
+        'total_days': request.days,
+        'analysis_timestamp': datetime.utcnow().isoformat() + 'Z',
+        **extra_meta,
+        'result_token': token
+    }
+    if result.get('metrics'):
+        meta['metrics'] = result['metrics']
+    
+    previous = await load_snapshot(previous_token) if previous_token else None
+    if previous is not None:
+        daily_delta = diff_snapshots(previous, build_snapshot(result['daily_risk']))
+        meta['delta'] = {'base_token': previous_token, 'status': 'applied', 'days_changed': len(daily_delta)}
+        response = RiskAnalysisResponse(
+            meta=meta,
+            daily_risk=[],
+            daily_delta=[DailyRiskDelta(**delta) for delta in daily_delta]
+        )
+    else:
+        if previous_token:
+            # Unknown or expired base: fall back to the full result
+            meta['delta'] = {'base_token': previous_token, 'status': 'unavailable'}
+        response = RiskAnalysisResponse(
+            meta=meta,
+            daily_risk=[
+                DailyRiskProfile(**profile) for profile in result['daily_risk']
+            ]
+        )
+    
+    if profile is not None:
+        profile.save()
+        response.meta['profile'] = {
+            'profile_id': profile.profile_id,
+            'format': 'pstats',
+            'download_url': str(http_request.url_for('get_profile', profile_id=profile.profile_id)),
+            'stages': profile.summary(),
+        }
+        http_response.headers['Cache-Control'] = 'no-store'
+        return response
+    
+    http_response.headers.update(cache_headers(response_etag, settings.CACHE_MAX_AGE_SECONDS))
+    return response
+
+
 @router.get("/health")
 async def health() -> Dict[str, str]:
     """Health check endpoint."""
@@ -33,9 +191,11 @@ async def health() -> Dict[str, str]:
     }
 
 
-@router.post("/analyze", response_model=RiskAnalysisResponse)
+@router.post("/analyze", response_model=RiskAnalysisResponse, response_model_exclude_unset=True)
 async def analyze_risk(
     request: RiskAnalysisRequest,
+    http_request: Request,
+    http_response: Response,
     client: WeatherLabClient = Depends(get_weather_client)
 ) -> RiskAnalysisResponse:
     """
@@ -55,39 +215,21 @@ async def analyze_risk(
             request.days
         )
         
-        # Calculate risk profile
-        calculator = RiskCalculator()
-        result = calculator.calculate_risk_profile(
-            hurricane_data,
-            request.date,
-            request.days
-        )
-        
-        # Build response
-        end_date = (datetime.strptime(request.date, '%Y-%m-%d') + 
-                   timedelta(days=request.days-1)).strftime('%Y-%m-%d')
-        
-        response = RiskAnalysisResponse(
-            meta={
-                'start_date': request.date,
-                'end_date': end_date,
-                'total_days': request.days,
-                'analysis_timestamp': datetime.utcnow().isoformat() + 'Z'
-            },
-            daily_risk=[
-                DailyRiskProfile(**profile) for profile in result['daily_risk']
-            ]
+        return await _analyze(
+            request, hurricane_data, request.date, http_request, http_response
         )
         
-        return response
-        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze-range", response_model=RiskAnalysisResponse)
+@router.post("/analyze-range", response_model=RiskAnalysisResponse, response_model_exclude_unset=True)
 async def analyze_risk_range(
     request: RiskAnalysisRangeRequest,
+    http_request: Request,
+    http_response: Response,
     client: WeatherLabClient = Depends(get_weather_client)
 ) -> RiskAnalysisResponse:
     """
@@ -107,39 +249,21 @@ async def analyze_risk_range(
             request.days
         )
         
-        # Calculate risk profile
-        calculator = RiskCalculator()
-        result = calculator.calculate_risk_profile(
-            hurricane_data,
-            request.start_date,
-            request.days
-        )
-        
-        # Build response
-        end_date = (datetime.strptime(request.start_date, '%Y-%m-%d') + 
-                   timedelta(days=request.days-1)).strftime('%Y-%m-%d')
-        
-        response = RiskAnalysisResponse(
-            meta={
-                'start_date': request.start_date,
-                'end_date': end_date,
-                'total_days': request.days,
-                'analysis_timestamp': datetime.utcnow().isoformat() + 'Z'
-            },
-            daily_risk=[
-                DailyRiskProfile(**profile) for profile in result['daily_risk']
-            ]
+        return await _analyze(
+            request, hurricane_data, request.start_date, http_request, http_response
         )
         
-        return response
-        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/analyze-records", response_model=RiskAnalysisResponse)
+@router.post("/analyze-records", response_model=RiskAnalysisResponse, response_model_exclude_unset=True)
 async def analyze_risk_with_data(
-    request: RiskAnalysisWithDataRequest
+    request: RiskAnalysisWithDataRequest,
+    http_request: Request,
+    http_response: Response
 ) -> RiskAnalysisResponse:
     """
     Analyze risk using provided weather data (no external API calls).
@@ -181,33 +305,13 @@ async def analyze_risk_with_data(
             'data': request.data
         }
         
-        # Calculate risk profile using provided data
-        calculator = RiskCalculator()
-        result = calculator.calculate_risk_profile(
-            hurricane_data,
-            request.start_date,
-            request.days
-        )
-        
-        # Build response
-        end_date = (datetime.strptime(request.start_date, '%Y-%m-%d') + 
-                   timedelta(days=request.days-1)).strftime('%Y-%m-%d')
-        
-        response = RiskAnalysisResponse(
-            meta={
-                'start_date': request.start_date,
-                'end_date': end_date,
-                'total_days': request.days,
-                'analysis_timestamp': datetime.utcnow().isoformat() + 'Z',
-                'data_source': 'provided'
-            },
-            daily_risk=[
-                DailyRiskProfile(**profile) for profile in result['daily_risk']
-            ]
+        return await _analyze(
+            request, hurricane_data, request.start_date, http_request, http_response,
+            data_source='provided'
         )
         
-        return response
-        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
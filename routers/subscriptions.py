@@ -0,0 +1,94 @@
+"""
+Server-sent event subscriptions for risk updates
+"""
+import asyncio
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from core.config import settings
+from models.requests import SUPPORTED_RESOLUTIONS_HOURS
+from services.subscriptions import SubscriptionLimitReached, subscription_hub
+
+router = APIRouter()
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/subscribe")
+async def subscribe_risk(
+    request: Request,
+    start_date: str = Query(..., description="Start date in YYYY-MM-DD format"),
+    days: int = Query(..., ge=1, le=30, description="Number of days to watch (1-30)"),
+    resolution_hours: int = Query(default=24, description="Exposure window size in hours"),
+    airports: Optional[str] = Query(default=None, description="Comma-separated airport codes to include")
+) -> StreamingResponse:
+    """
+    Stream daily risk profiles for a window as server-sent events.
+
+    All clients watching the same window share one upstream poll and one
+    computation. Each `daily_risk` event carries a full `DailyRiskProfile`
+    and is only sent when that day's profile changes.
+
+    Args:
+        request: Incoming request, used to detect disconnects
+        start_date: Start of the watched window
+        days: Number of days in the window
+        resolution_hours: Sub-daily window size (24 for daily only)
+        airports: Optional airport filter
+
+    Returns:
+        `text/event-stream` response
+
+    Raises:
+        HTTPException: 422 for an invalid window, 429 when this worker
+            already polls ``SUBSCRIPTION_MAX_WINDOWS`` other windows
+    """
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+    except ValueError:
+        raise HTTPException(status_code=422, detail="start_date must be in YYYY-MM-DD format")
+    if resolution_hours not in SUPPORTED_RESOLUTIONS_HOURS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"resolution_hours must be one of {SUPPORTED_RESOLUTIONS_HOURS}"
+        )
+    airport_filter = {code.strip().upper() for code in airports.split(',') if code.strip()} if airports else None
+
+    try:
+        key, subscriber = subscription_hub.subscribe(start_date, days, resolution_hours, airport_filter)
+    except SubscriptionLimitReached as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={'Retry-After': str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+        )
+
+    async def event_stream():
+        try:
+            yield f"retry: {int(settings.SUBSCRIPTION_POLL_SECONDS * 1000)}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    profile = await asyncio.wait_for(
+                        subscriber.queue.get(),
+                        timeout=settings.SUBSCRIPTION_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse_event("daily_risk", profile)
+        finally:
+            subscription_hub.unsubscribe(key, subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,163 @@
+"""
+Cost-aware admission control for risk analyses
+"""
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Tuple
+
+from core.config import settings
+
+# Lanes in dispatch order: cheap interactive requests never wait behind bulk ones
+LANES = ("interactive", "bulk")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; maps to an HTTP error."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+def estimate_cost(days: int, records: int, airports: int) -> float:
+    """
+    Estimate the work of an analysis in distance evaluations.
+
+    Args:
+        days: Days in the window
+        records: Total hurricane records in the window
+        airports: Airports in the catalog
+
+    Returns:
+        days x average records per day x airports (at least one unit per day)
+    """
+    days = max(1, days)
+    return float(days * max(1.0, records / days) * max(1, airports))
+
+
+class AdmissionController:
+    """
+    Bound the total estimated cost of analyses running in this worker.
+
+    Requests whose cost fits the remaining budget start immediately. Others
+    wait in a bounded per-lane queue; a full queue is rejected with 429 and a
+    request that waits longer than ``queue_timeout`` is rejected with 503, both
+    with ``Retry-After``. A request costing more than the whole budget is
+    clamped so it can still run alone.
+    """
+
+    def __init__(
+        self,
+        max_inflight_cost: float,
+        interactive_cost_threshold: float,
+        queue_limits: Dict[str, int],
+        queue_timeout: float,
+        retry_after: int
+    ):
+        self.max_inflight_cost = max_inflight_cost
+        self.interactive_cost_threshold = interactive_cost_threshold
+        self.queue_limits = queue_limits
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.inflight_cost = 0.0
+        self.queues: Dict[str, Deque[Tuple[float, asyncio.Future]]] = {lane: deque() for lane in LANES}
+        self.rejected = {429: 0, 503: 0}
+
+    def lane_for(self, cost: float) -> str:
+        """Pick the priority lane for a request cost."""
+        return "interactive" if cost <= self.interactive_cost_threshold else "bulk"
+
+    def _fits(self, cost: float) -> bool:
+        return self.inflight_cost + cost <= self.max_inflight_cost
+
+    def _has_waiters(self, up_to_lane: str) -> bool:
+        """Whether anyone of equal or higher priority is already queued."""
+        for lane in LANES:
+            if self.queues[lane]:
+                return True
+            if lane == up_to_lane:
+                return False
+        return False
+
+    def _dispatch(self) -> None:
+        """Start queued requests, highest-priority lane first, while budget allows."""
+        for lane in LANES:
+            queue = self.queues[lane]
+            while queue:
+                cost, future = queue[0]
+                if future.done():
+                    queue.popleft()
+                    continue
+                if not self._fits(cost):
+                    # Keep FIFO within a lane and do not let bulk jump ahead
+                    return
+                queue.popleft()
+                self.inflight_cost += cost
+                future.set_result(None)
+
+    def _reject(self, status_code: int, detail: str) -> AdmissionRejected:
+        self.rejected[status_code] += 1
+        return AdmissionRejected(status_code, detail, self.retry_after)
+
+    @asynccontextmanager
+    async def admit(self, cost: float) -> AsyncIterator[None]:
+        """Hold budget for ``cost`` for the duration of the block."""
+        cost = min(cost, self.max_inflight_cost)
+        lane = self.lane_for(cost)
+
+        if self._fits(cost) and not self._has_waiters(lane):
+            self.inflight_cost += cost
+        else:
+            queue = self.queues[lane]
+            if len(queue) >= self.queue_limits.get(lane, 0):
+                raise self._reject(429, f"Too many queued {lane} analyses, retry later")
+
+            future = asyncio.get_running_loop().create_future()
+            queue.append((cost, future))
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                if future.done():
+                    # Admitted just as the wait expired: give the budget back
+                    self.inflight_cost -= cost
+                    self._dispatch()
+                else:
+                    future.cancel()
+                raise self._reject(503, "Analysis capacity exhausted, retry later")
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.inflight_cost -= cost
+                    self._dispatch()
+                else:
+                    future.cancel()
+                raise
+
+        try:
+            yield
+        finally:
+            self.inflight_cost -= cost
+            self._dispatch()
+
+    def stats(self) -> dict:
+        """Current load, queue depths and rejection counts."""
+        return {
+            'inflight_cost': self.inflight_cost,
+            'max_inflight_cost': self.max_inflight_cost,
+            'queued': {lane: len(queue) for lane, queue in self.queues.items()},
+            'rejected': dict(self.rejected),
+        }
+
+
+admission_controller = AdmissionController(
+    max_inflight_cost=settings.ADMISSION_MAX_INFLIGHT_COST,
+    interactive_cost_threshold=settings.ADMISSION_INTERACTIVE_COST,
+    queue_limits={
+        "interactive": settings.ADMISSION_INTERACTIVE_QUEUE,
+        "bulk": settings.ADMISSION_BULK_QUEUE,
+    },
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS
+)
@@ -0,0 +1,265 @@
+"""
+Cache backends for upstream data and computed results
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Versioned, TTL'd and size-bounded key/value cache.
+
+    Values must be JSON-serializable. Keys are namespaced by ``version`` so a
+    deploy that changes cached formats can bump ``CACHE_VERSION`` instead of
+    flushing the store. Callers must treat returned values as read-only.
+    Async code should use ``aget``/``aset``, which keep backends that may wait
+    on I/O or locks (``blocking``) off the event loop.
+    """
+
+    blocking = False
+
+    def __init__(self, version: str, default_ttl: float, max_entries: int):
+        self.version = version
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.version}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired."""
+        value = self._get(self._key(key))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ``ttl`` seconds (the backend default when omitted)."""
+        expires_at = time.time() + (self.default_ttl if ttl is None else ttl)
+        self._set(self._key(key), value, expires_at)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """``get`` for async callers."""
+        if self.blocking:
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """``set`` for async callers."""
+        if self.blocking:
+            await asyncio.to_thread(self.set, key, value, ttl)
+        else:
+            self.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        self._delete(self._key(key))
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process."""
+        total = self.hits + self.misses
+        return {
+            'backend': type(self).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, value: Any, expires_at: float) -> None:
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache (the default; not shared between workers)."""
+
+    def __init__(self, version: str = "1", default_ttl: float = 300.0, max_entries: int = 1024):
+        super().__init__(version, default_ttl, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache stored in a local SQLite file, shared by every worker on the host.
+
+    WAL mode lets readers in one worker proceed while another writes. Entries
+    are evicted least-recently-used once either ``max_entries`` or
+    ``max_bytes`` is exceeded; expired rows are dropped on writes. Reads only
+    write back ``accessed_at`` when it is older than ``touch_interval``
+    seconds, so hits rarely contend for the write lock.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        version: str = "1",
+        default_ttl: float = 300.0,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        touch_interval: float = 60.0
+    ):
+        super().__init__(version, default_ttl, max_entries)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite handles cross-process locking."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[Any]:
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        if now - row[2] >= self.touch_interval:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any, expires_at: float) -> None:
+        payload = json.dumps(value, separators=(',', ':'))
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), expires_at, now)
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired rows, then least-recently-used rows until within bounds."""
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        count, total_bytes = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return
+        freed_entries, freed_bytes = 0, 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+            if count - freed_entries <= self.max_entries and total_bytes - freed_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed_entries += 1
+            freed_bytes += size
+        conn.executemany("DELETE FROM cache WHERE key = ?", doomed)
+
+    def _delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache")
+
+
+def create_cache() -> CacheBackend:
+    """Build the cache backend selected by ``CACHE_BACKEND``."""
+    if settings.CACHE_BACKEND == "sqlite":
+        return SQLiteCache(
+            settings.CACHE_PATH,
+            version=settings.CACHE_VERSION,
+            default_ttl=settings.CACHE_TTL_SECONDS,
+            max_entries=settings.CACHE_MAX_ENTRIES,
+            max_bytes=settings.CACHE_MAX_BYTES
+        )
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(
+            version=settings.CACHE_VERSION,
+            default_ttl=settings.CACHE_TTL_SECONDS,
+            max_entries=settings.CACHE_MAX_ENTRIES
+        )
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND!r}")
+
+
+_cache: Optional[CacheBackend] = None
+
+
+def get_cache() -> CacheBackend:
+    """Process-wide cache backend, created on first use."""
+    global _cache
+    if _cache is None:
+        _cache = create_cache()
+    return _cache
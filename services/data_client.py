@@ -2,21 +2,43 @@
 Data client for fetching hurricane data from weather-lab-data-api
 """
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+from core.config import settings
+from services.cache import CacheBackend, get_cache
 
 
 class WeatherLabClient:
     """Client for interacting with weather-lab-data-api."""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, cache: Optional[CacheBackend] = None):
         """
         Initialize the WeatherLab client.
         
         Args:
             base_url: Base URL of the weather-lab-data-api
+            cache: Cache for upstream responses (defaults to the shared backend)
         """
         self.base_url = base_url
         self.client = httpx.AsyncClient(timeout=30.0)
+        self.cache = cache if cache is not None else get_cache()
+        self.cache_ttl = settings.UPSTREAM_CACHE_TTL_SECONDS
+    
+    async def _get_json(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a JSON document, served from the cache while fresh."""
+        key = "upstream:" + path + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+        if self.cache_ttl > 0:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+        
+        response = await self.client.get(f"{self.base_url}{path}", params=params)
+        response.raise_for_status()
+        payload = response.json()
+        
+        if self.cache_ttl > 0:
+            await self.cache.aset(key, payload, ttl=self.cache_ttl)
+        return payload
     
     async def get_hurricane_data(self, date: str) -> Dict[str, Any]:
         """
@@ -28,13 +50,7 @@ class WeatherLabClient:
         Returns:
             Dictionary with 'meta' and 'records' keys
         """
-        url = f"{self.base_url}/data"
-        params = {"date": date}
-        
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        
-        return response.json()
+        return await self._get_json("/data", {"date": date})
     
     async def get_hurricane_data_range(self, start_date: str, days: int) -> Dict[str, Any]:
         """
@@ -47,15 +63,17 @@ class WeatherLabClient:
         Returns:
             Dictionary with 'meta' and 'data' keys
         """
-        url = f"{self.base_url}/data-range"
-        params = {"start": start_date, "days": days}
-        
-        response = await self.client.get(url, params=params)
-        response.raise_for_status()
-        
-        return response.json()
+        return await self._get_json("/data-range", {"start": start_date, "days": days})
     
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
 
+
+async def fetch_hurricane_data_range(start_date: str, days: int) -> Dict[str, Any]:
+    """Fetch a window of hurricane data with a short-lived WeatherLab client."""
+    client = WeatherLabClient(settings.WEATHER_LAB_API_URL)
+    try:
+        return await client.get_hurricane_data_range(start_date, days)
+    finally:
+        await client.close()
@@ -0,0 +1,96 @@
+"""
+Compact result snapshots and deltas between forecast cycles
+"""
+import hashlib
+from typing import Dict, List, Any, Optional
+
+from core.config import settings
+from services.cache import get_cache
+
+# Snapshot entry layout: airport code -> [travelers, distance_km, risk_level, airport_name]
+Snapshot = Dict[str, Dict[str, list]]
+
+
+def result_token(etag: str) -> str:
+    """Token identifying a result; the unquoted input ETag."""
+    return etag.strip('"')
+
+
+def delta_etag(etag: str, previous_token: str) -> str:
+    """ETag for a delta response, which depends on both results."""
+    digest = hashlib.sha256(f"{result_token(etag)}:{previous_token}".encode('utf-8'))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def build_snapshot(daily_risk: List[Dict[str, Any]]) -> Snapshot:
+    """Reduce daily profiles to what is needed to diff airport entries."""
+    return {
+        profile['date']: {
+            airport['airport_code']: [
+                airport['travelers_at_risk'],
+                airport['distance_to_hurricane_km'],
+                airport['risk_level'],
+                airport['airport_name'],
+            ]
+            for airport in profile['airports_at_risk']
+        }
+        for profile in daily_risk
+    }
+
+
+async def store_snapshot(token: str, daily_risk: List[Dict[str, Any]]) -> None:
+    """Keep a snapshot of a result so later requests can diff against it."""
+    cache = get_cache()
+    key = f"snapshot:{token}"
+    if await cache.aget(key) is None:
+        await cache.aset(key, build_snapshot(daily_risk), ttl=settings.SNAPSHOT_TTL_SECONDS)
+
+
+async def load_snapshot(token: str) -> Optional[Snapshot]:
+    """Snapshot for a result token, or None if unknown or expired."""
+    return await get_cache().aget(f"snapshot:{token}")
+
+
+def _airport(code: str, entry: list) -> Dict[str, Any]:
+    travelers, distance_km, risk_level, name = entry
+    return {
+        'airport_code': code,
+        'airport_name': name,
+        'travelers_at_risk': travelers,
+        'distance_to_hurricane_km': distance_km,
+        'risk_level': risk_level,
+    }
+
+
+def diff_snapshots(previous: Snapshot, current: Snapshot) -> List[Dict[str, Any]]:
+    """
+    Per-day airport changes between two snapshots.
+
+    Days present in only one snapshot diff against an empty day. Days without
+    changes are omitted.
+
+    Returns:
+        List of {date, added, removed, changed, total_travelers_at_risk} dicts
+        sorted by date; ``removed`` lists airport codes
+    """
+    deltas = []
+    for date in sorted(set(previous) | set(current)):
+        before = previous.get(date, {})
+        after = current.get(date, {})
+        added = [_airport(code, after[code]) for code in after if code not in before]
+        removed = sorted(code for code in before if code not in after)
+        changed = [
+            _airport(code, after[code]) for code in after
+            if code in before and list(before[code]) != list(after[code])
+        ]
+        if added or removed or changed:
+            added.sort(key=lambda x: x['travelers_at_risk'], reverse=True)
+            changed.sort(key=lambda x: x['travelers_at_risk'], reverse=True)
+            deltas.append({
+                'date': date,
+                'added': added,
+                'removed': removed,
+                'changed': changed,
+                'total_travelers_at_risk': sum(entry[0] for entry in after.values()),
+            })
+    return deltas
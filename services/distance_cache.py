@@ -0,0 +1,132 @@
+"""
+Cross-request memo of storm-position to airport distances
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from geopy.distance import geodesic
+
+from core.airports import MAJOR_AIRPORTS
+from core.config import settings
+from services.regions import AirportRegion
+
+
+class DistanceMemo:
+    """
+    Bounded LRU memo mapping a storm position to its distance to every airport.
+
+    Positions are quantized to ``precision_deg`` (e.g. 0.01 degrees, about
+    1 km) and distances are computed from the quantized point, so results do
+    not depend on which request populated an entry. Ensemble members and
+    consecutive forecast cycles that repeat nearly identical positions then
+    reuse the same vector. A precision of 0 keys on exact coordinates.
+    Lookups can be limited to one airport region, in which case entries hold
+    only that region's distances.
+    """
+
+    def __init__(self, airports: dict, precision_deg: float = 0.01, max_entries: int = 50_000):
+        self.airport_codes = list(airports)
+        self.airport_coords = [(airports[code]['lat'], airports[code]['lon']) for code in self.airport_codes]
+        self.precision_deg = precision_deg
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, lat: float, lon: float) -> Hashable:
+        if self.precision_deg <= 0:
+            return (lat, lon)
+        return (int(round(lat / self.precision_deg)), int(round(lon / self.precision_deg)))
+
+    def _point(self, key: Hashable) -> Tuple[float, float]:
+        if self.precision_deg <= 0:
+            return key
+        return (key[0] * self.precision_deg, key[1] * self.precision_deg)
+
+    def _compute(self, point: Tuple[float, float], columns: Optional[np.ndarray] = None) -> np.ndarray:
+        """Distance in kilometers from a point to every airport (or the given columns)."""
+        coords = self.airport_coords if columns is None else [self.airport_coords[c] for c in columns]
+        vector = np.array([geodesic(airport, point).kilometers for airport in coords])
+        vector.setflags(write=False)
+        return vector
+
+    def distances(self, positions: List[Tuple[float, float]], stats: Optional[Dict[str, int]] = None,
+                  region: Optional[AirportRegion] = None) -> np.ndarray:
+        """
+        Distance matrix between positions and airports.
+
+        Duplicate positions (after quantization) are resolved once.
+
+        Args:
+            positions: (lat, lon) storm positions
+            stats: Optional per-request counters updated in place
+            region: Only compute distances to this region's airports
+
+        Returns:
+            Array of shape (len(positions), airports), or (len(positions),
+            region airports) with a region
+        """
+        width = len(self.airport_codes) if region is None else len(region.columns)
+        if not positions:
+            return np.empty((0, width))
+
+        keys = [self._key(lat, lon) for lat, lon in positions]
+        if region is not None:
+            keys = [(region.name, key) for key in keys]
+        unique_keys = list(dict.fromkeys(keys))
+
+        vectors = {}
+        missing = []
+        with self._lock:
+            for key in unique_keys:
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    vectors[key] = vector
+            hits = len(unique_keys) - len(missing)
+            self.hits += hits
+            self.misses += len(missing)
+
+        for key in missing:
+            if region is None:
+                vectors[key] = self._compute(self._point(key))
+            else:
+                vectors[key] = self._compute(self._point(key[1]), region.columns)
+
+        if missing:
+            with self._lock:
+                for key in missing:
+                    self._entries[key] = vectors[key]
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if stats is not None:
+            stats['positions'] = stats.get('positions', 0) + len(positions)
+            stats['unique_positions'] = stats.get('unique_positions', 0) + len(unique_keys)
+            stats['hits'] = stats.get('hits', 0) + hits
+            stats['misses'] = stats.get('misses', 0) + len(missing)
+
+        return np.vstack([vectors[key] for key in keys])
+
+    def stats(self) -> dict:
+        """Lifetime counters for this process."""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'precision_deg': self.precision_deg,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+distance_memo = DistanceMemo(
+    MAJOR_AIRPORTS,
+    precision_deg=settings.DISTANCE_MEMO_PRECISION_DEG,
+    max_entries=settings.DISTANCE_MEMO_MAX_ENTRIES
+)
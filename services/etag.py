@@ -0,0 +1,79 @@
+"""
+Content-derived ETags for conditional risk analysis requests
+"""
+import hashlib
+import json
+from typing import Dict, Any, Optional
+
+import pandas as pd
+
+from core.airports import AIRPORT_CATALOG_VERSION
+from core.config import settings
+from services.traveler_model import get_traveler_model
+
+
+def _canonical(value: Any) -> str:
+    """Serialize a value to a stable JSON string."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def compute_etag(hurricane_data: dict, start_date: str, days: int, radius_km: float,
+                 **options: Any) -> str:
+    """
+    Compute a strong ETag from the normalized analysis inputs.
+
+    Only the records inside the requested window contribute, and record order
+    within a day is ignored, so upstream metadata or reordering does not change
+    the tag. Volatile output such as ``analysis_timestamp`` is never hashed.
+
+    Args:
+        hurricane_data: Weather data with a 'data' key ({date: {records: [...]}})
+        start_date: Start date string in YYYY-MM-DD format
+        days: Number of days in the window
+        radius_km: Risk radius used for the analysis
+        **options: Any further parameters that change the result
+
+    Returns:
+        Quoted ETag value suitable for the ``ETag`` header
+    """
+    data_by_date = hurricane_data.get('data', {}) or {}
+    digest = hashlib.sha256()
+    digest.update(_canonical({
+        'start_date': start_date,
+        'days': days,
+        'radius_km': radius_km,
+        'catalog': AIRPORT_CATALOG_VERSION,
+        'calendar': get_traveler_model().calendar.version,
+        'distance_precision': settings.DISTANCE_MEMO_PRECISION_DEG,
+        'options': options,
+    }).encode('utf-8'))
+
+    for date in pd.date_range(start=start_date, periods=days, freq='D'):
+        date_str = date.strftime('%Y-%m-%d')
+        records = (data_by_date.get(date_str) or {}).get('records', []) or []
+        digest.update(date_str.encode('utf-8'))
+        for record in sorted(_canonical(record) for record in records):
+            digest.update(record.encode('utf-8'))
+
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header value against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == '*' or tag == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str, max_age: int) -> Dict[str, str]:
+    """Build the caching headers sent with both 200 and 304 responses."""
+    return {
+        'ETag': etag,
+        'Cache-Control': f'private, max-age={max_age}, must-revalidate',
+    }
@@ -0,0 +1,194 @@
+"""
+Background jobs for long-running risk analyses
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from core.config import settings
+from services.cache import SQLiteCache
+from services.data_client import fetch_hurricane_data_range
+from services.risk_calculator import RiskCalculator
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are pending in this worker."""
+
+
+class JobStore:
+    """
+    Job status and results in a local SQLite file.
+
+    Built on the SQLite cache backend, so entries expire after
+    ``JOB_RESULT_TTL_SECONDS`` and the file stays within its size bound.
+    Every API worker and job process opens the same file, so any worker can
+    answer status and result polls.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._store = SQLiteCache(
+            path,
+            version="jobs",
+            default_ttl=settings.JOB_RESULT_TTL_SECONDS,
+            max_entries=settings.JOB_STORE_MAX_ENTRIES,
+            max_bytes=settings.JOB_STORE_MAX_BYTES
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Status record for a job, or None if unknown or expired."""
+        return self._store.get(f"status:{job_id}")
+
+    def save(self, job: Dict[str, Any]) -> None:
+        self._store.set(f"status:{job['job_id']}", job)
+
+    def update(self, job_id: str, **fields: Any) -> Dict[str, Any]:
+        """Merge fields into a job's status record."""
+        job = self.get(job_id) or {'job_id': job_id}
+        job.update(fields)
+        self.save(job)
+        return job
+
+    def put_result(self, job_id: str, result: Dict[str, Any]) -> None:
+        self._store.set(f"result:{job_id}", result)
+
+    def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._store.get(f"result:{job_id}")
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
+
+
+def run_job(job_id: str, store_path: str, payload: Dict[str, Any]) -> None:
+    """
+    Execute one analysis job (runs in a pool worker process).
+
+    Progress is written to the store at most once per second; the final
+    response document is stored under the job's result key.
+    """
+    store = JobStore(store_path)
+    store.update(job_id, status='running', started_at=_now())
+    start_date = payload['start_date']
+    days = payload['days']
+    last_report = [0.0]
+
+    def report(done: int, total: int) -> None:
+        now = time.monotonic()
+        if done == total or now - last_report[0] >= 1.0:
+            last_report[0] = now
+            store.update(job_id, progress={'days_done': done, 'days_total': total})
+
+    try:
+        if payload.get('data') is not None:
+            hurricane_data = {'data': payload['data']}
+            data_source = 'provided'
+        else:
+            hurricane_data = asyncio.run(fetch_hurricane_data_range(start_date, days))
+            data_source = 'weather-lab-data-api'
+
+        calculator = RiskCalculator()
+        result = calculator.calculate_risk_profile(
+            hurricane_data, start_date, days, progress=report, **payload['options']
+        )
+
+        end_date = (datetime.strptime(start_date, '%Y-%m-%d') +
+                    timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        meta = {
+            'start_date': start_date,
+            'end_date': end_date,
+            'total_days': days,
+            'analysis_timestamp': _now(),
+            'data_source': data_source,
+            'job_id': job_id
+        }
+        if result.get('metrics'):
+            meta['metrics'] = result['metrics']
+        store.put_result(job_id, {'meta': meta, 'daily_risk': result['daily_risk']})
+        store.update(job_id, status='succeeded', finished_at=_now())
+    except Exception as e:
+        store.update(job_id, status='failed', finished_at=_now(), error=str(e))
+
+
+class JobManager:
+    """Submit analyses to a background worker pool and track them in a JobStore."""
+
+    def __init__(self, store_path: str, executor: Optional[Executor] = None,
+                 max_pending: Optional[int] = None):
+        self.store = JobStore(store_path)
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=settings.JOB_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self.max_pending = max_pending if max_pending is not None else settings.JOB_MAX_PENDING
+        self._pending: Dict[str, Future] = {}
+
+    def pending(self) -> int:
+        """Jobs submitted by this worker that have not finished."""
+        self._pending = {job_id: f for job_id, f in self._pending.items() if not f.done()}
+        return len(self._pending)
+
+    def submit(self, start_date: str, days: int, options: Dict[str, Any],
+               data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Queue an analysis job.
+
+        Raises:
+            JobQueueFull: When ``max_pending`` jobs are already waiting or running
+        """
+        if self.pending() >= self.max_pending:
+            raise JobQueueFull(f"{self.max_pending} jobs already pending")
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'status': 'queued',
+            'submitted_at': _now(),
+            'start_date': start_date,
+            'days': days,
+            'progress': {'days_done': 0, 'days_total': days},
+        }
+        self.store.save(job)
+        payload = {'start_date': start_date, 'days': days, 'options': options, 'data': data}
+        future = self.executor.submit(run_job, job_id, self.store.path, payload)
+        self._pending[job_id] = future
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        return job
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        """Record jobs whose worker died before reporting (e.g. killed process)."""
+        error = future.exception() if not future.cancelled() else None
+        if future.cancelled() or error is not None:
+            self.store.update(job_id, status='failed', finished_at=_now(),
+                              error=str(error) if error else 'cancelled')
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Process-wide job manager; the worker pool starts on first use."""
+    global _manager
+    if _manager is None:
+        # Job routes run in the threadpool, so first use can race
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager(settings.JOB_STORE_PATH)
+    return _manager
+
+
+def shutdown_job_manager() -> None:
+    """Stop the worker pool (application shutdown)."""
+    global _manager
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
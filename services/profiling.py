@@ -0,0 +1,108 @@
+"""
+On-demand profiling of individual analysis requests
+"""
+import cProfile
+import hmac
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from core.config import settings
+
+PROFILE_HEADER = "x-profile-token"
+
+
+def profiling_requested(token: Optional[str]) -> bool:
+    """
+    Check a request's profile token against ``PROFILING_TOKEN``.
+
+    Profiling is off unless the operator configured a token and the request
+    presents the same value.
+    """
+    if not settings.PROFILING_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), settings.PROFILING_TOKEN.encode('utf-8'))
+
+
+class StageTimer:
+    """Accumulates wall and CPU time per named stage."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {'wall_ms': 0.0, 'cpu_ms': 0.0, 'calls': 0})
+            entry['wall_ms'] += (time.perf_counter() - wall) * 1000
+            entry['cpu_ms'] += (time.thread_time() - cpu) * 1000
+            entry['calls'] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Stage timings rounded for the response meta."""
+        return {
+            name: {
+                'wall_ms': round(entry['wall_ms'], 3),
+                'cpu_ms': round(entry['cpu_ms'], 3),
+                'calls': entry['calls'],
+            }
+            for name, entry in self.stages.items()
+        }
+
+
+class RequestProfile(StageTimer):
+    """
+    Deterministic (cProfile) profile plus stage timings for one request.
+
+    ``runcall`` profiles and times the calling thread only, so it has to wrap
+    the function on the thread that executes it (e.g. inside the threadpool);
+    ``thread_time`` would otherwise report another thread's CPU.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.profile_id = uuid.uuid4().hex
+        self.profiler = cProfile.Profile()
+
+    def runcall(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Profile ``func`` and time it as the 'calculate' stage on this thread."""
+        with self.stage('calculate'):
+            return self.profiler.runcall(func, *args, **kwargs)
+
+    def save(self, directory: Optional[str] = None) -> str:
+        """
+        Write the profile as a pstats file and prune old profiles.
+
+        Returns:
+            Path of the written file
+        """
+        directory = directory or settings.PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = profile_path(self.profile_id, directory)
+        self.profiler.dump_stats(path)
+        _prune(directory, settings.PROFILE_MAX_FILES)
+        return path
+
+
+def profile_path(profile_id: str, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or settings.PROFILE_DIR, f"{profile_id}.pstats")
+
+
+def _prune(directory: str, max_files: int) -> None:
+    """Keep only the newest ``max_files`` profiles."""
+    files = [
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith('.pstats')
+    ]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[max_files:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,87 @@
+"""
+Airport regions with radius-expanded bounding boxes for per-day pruning
+"""
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+import numpy as np
+
+from core.airports import MAJOR_AIRPORTS
+
+# Kilometers per degree of latitude (lower bound, at the equator) and of
+# longitude at the equator; boxes are padded by BOX_MARGIN on top so that
+# rounding and ellipsoid effects never prune an airport that is in range
+KM_PER_DEG_LAT = 110.574
+KM_PER_DEG_LON = 111.320
+BOX_MARGIN = 1.1
+
+
+@dataclass(frozen=True, eq=False)
+class AirportRegion:
+    """
+    A group of airports and the box of positions that can be in range of them.
+
+    ``columns`` index the region's airports in catalog order. A storm
+    position outside ``(min_lat, max_lat, min_lon, max_lon)`` is farther than
+    the radius the box was built for from every airport in the region.
+    """
+    name: str
+    codes: Tuple[str, ...]
+    columns: np.ndarray
+    min_lat: float
+    max_lat: float
+    min_lon: float
+    max_lon: float
+
+    def contains(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Mask of positions inside the box."""
+        return (
+            (lats >= self.min_lat) & (lats <= self.max_lat) &
+            (lons >= self.min_lon) & (lons <= self.max_lon)
+        )
+
+
+def build_regions(airports: dict, radius_km: float) -> List[AirportRegion]:
+    """
+    Partition airports by their 'region' and expand each box by a radius.
+
+    Airports without a region form their own single-airport region. Boxes do
+    not wrap the antimeridian, which no catalog region crosses.
+    """
+    grouped = {}
+    for column, (code, info) in enumerate(airports.items()):
+        grouped.setdefault(info.get('region') or code, []).append((column, code, info))
+
+    regions = []
+    for name, members in grouped.items():
+        lats = [info['lat'] for _, _, info in members]
+        lons = [info['lon'] for _, _, info in members]
+        lat_pad = radius_km * BOX_MARGIN / KM_PER_DEG_LAT
+        min_lat = max(min(lats) - lat_pad, -90.0)
+        max_lat = min(max(lats) + lat_pad, 90.0)
+        # A degree of longitude is shortest at the box's most poleward edge
+        cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+        if cos_lat < 1e-6:
+            min_lon, max_lon = -180.0, 180.0
+        else:
+            lon_pad = radius_km * BOX_MARGIN / (KM_PER_DEG_LON * cos_lat)
+            min_lon = max(min(lons) - lon_pad, -180.0)
+            max_lon = min(max(lons) + lon_pad, 180.0)
+        regions.append(AirportRegion(
+            name=name,
+            codes=tuple(code for _, code, _ in members),
+            columns=np.array([column for column, _, _ in members]),
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lon=min_lon,
+            max_lon=max_lon,
+        ))
+    return regions
+
+
+@lru_cache(maxsize=32)
+def catalog_regions(radius_km: float) -> Tuple[AirportRegion, ...]:
+    """Regions of the airport catalog with boxes for a radius (cached per radius)."""
+    return tuple(build_regions(MAJOR_AIRPORTS, radius_km))
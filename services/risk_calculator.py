@@ -1,13 +1,46 @@
 """
 Risk calculation service for hurricane impact analysis
 """
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from geopy.distance import geodesic
+import numpy as np
 import pandas as pd
 
-from core.airports import MAJOR_AIRPORTS
+from core.airports import MAJOR_AIRPORTS, HOURLY_TRAFFIC_ANCHORS
 from core.config import settings
+from models.requests import SUPPORTED_RESOLUTIONS_HOURS
+from services.traveler_model import get_traveler_model
+from services.distance_cache import distance_memo
+from services.regions import catalog_regions
+
+
+def _hourly_traffic_shares() -> np.ndarray:
+    """Interpolate the hourly traffic anchors to 24 shares summing to one."""
+    anchor_hours = sorted(HOURLY_TRAFFIC_ANCHORS)
+    curve = np.interp(
+        np.arange(24) + 0.5,
+        anchor_hours,
+        [HOURLY_TRAFFIC_ANCHORS[hour] for hour in anchor_hours]
+    )
+    return curve / curve.sum()
+
+
+HOURLY_TRAFFIC_SHARES = _hourly_traffic_shares()
+
+_NO_STAGE = nullcontext()
+
+
+def _no_stage(name: str) -> nullcontext:
+    """Stage context used when the request is not being profiled."""
+    return _NO_STAGE
+
+
+# Distance thresholds (km) below which an airport is "high" / "medium" risk
+DEFAULT_RISK_BREAKPOINTS_KM = (50.0, 100.0)
 
 
 class RiskCalculator:
@@ -15,7 +48,12 @@ class RiskCalculator:
     
     def __init__(self):
         self.risk_radius_km = settings.RISK_RADIUS_KM
+        self.risk_breakpoints_km = DEFAULT_RISK_BREAKPOINTS_KM
         self.airport_data = self._load_airport_data()
+        self.traveler_model = get_traveler_model()
+        self.distance_memo = distance_memo
+        self.prune_radius_km = self.risk_radius_km
+        self.metrics = {'distance_memo': {}, 'regions': {}}
     
     def _load_airport_data(self) -> pd.DataFrame:
         """Load airport data from configuration."""
@@ -32,9 +70,10 @@ class RiskCalculator:
     
     def _determine_risk_level(self, distance_km: float) -> str:
         """Determine risk level based on distance from hurricane."""
-        if distance_km < 50:
+        high_km, medium_km = self.risk_breakpoints_km
+        if distance_km < high_km:
             return "high"
-        elif distance_km < 100:
+        elif distance_km < medium_km:
             return "medium"
         else:
             return "low"
@@ -47,9 +86,11 @@ class RiskCalculator:
         """Parse hurricane records from weather-lab-data-api response."""
         hurricanes = []
         for record in records:
+            # Storms are grouped by track_id: keep it hashable and string-typed
+            track_id = record.get('track_id')
             try:
                 hurr_data = {
-                    'track_id': record.get('track_id'),
+                    'track_id': None if track_id is None else str(track_id),
                     'valid_time': record.get('valid_time'),
                     'lat': float(record.get('lat', 0)),
                     'lon': float(record.get('lon', 0)),
@@ -63,37 +104,275 @@ class RiskCalculator:
     
     def calculate_daily_travelers(self, airport_code: str, date: datetime) -> int:
         """Calculate expected daily travelers for an airport on a specific date."""
-        airport = self.airport_data[self.airport_data['airport_code'] == airport_code]
-        if airport.empty:
+        column = self.traveler_model.airport_index.get(airport_code)
+        if column is None:
             return 0
+        volumes = self.traveler_model.volume_matrix(date.strftime('%Y-%m-%d'), 1)
+        return int(volumes[0, column])
+    
+    def _parse_valid_time(self, value: Any) -> Optional[pd.Timestamp]:
+        """Parse a record's valid_time as a UTC timestamp (None if missing or invalid)."""
+        if not value:
+            return None
+        try:
+            timestamp = pd.Timestamp(value)
+        except (ValueError, TypeError):
+            return None
+        if timestamp is pd.NaT:
+            return None
+        if timestamp.tzinfo is None:
+            return timestamp.tz_localize('UTC')
+        return timestamp.tz_convert('UTC')
+    
+    def _storm_distances(
+        self,
+        hurricanes: List[Dict[str, Any]],
+        record_regions: bool = False
+    ) -> Tuple[List[Optional[str]], np.ndarray]:
+        """
+        Minimum distance from each storm to each airport.
         
-        baseline_capacity = airport.iloc[0]['baseline_capacity']
+        Only regions whose box (expanded by ``prune_radius_km``) contains a
+        position are evaluated; pruned airports get inf. Positions are then
+        grouped by track_id and reduced in a single ``np.minimum.reduceat``
+        pass, so the per-storm breakdown costs about the same as the aggregate.
         
-        # Simple seasonality based on month (can be enhanced later)
-        month = date.month
+        Args:
+            hurricanes: Parsed hurricane positions
+            record_regions: Count this pass in ``metrics['regions']`` (the
+                daily pass only, so counts are per day)
         
-        # Spring/summer multipliers (rough approximation)
-        if month in [3, 4, 5, 6, 7, 8]:
-            multiplier = 1.2  # Peak travel season
-        elif month in [11, 12, 1]:
-            multiplier = 1.1  # Holiday season
-        else:
-            multiplier = 1.0  # Base
-        
-        # Day of week multiplier
-        dow = date.weekday()
-        if dow in [4, 5, 6]:  # Friday, Saturday, Sunday
-            dow_multiplier = 1.2
-        elif dow in [0, 1]:  # Monday, Tuesday
-            dow_multiplier = 0.9
-        else:
-            dow_multiplier = 1.0
+        Returns:
+            Tuple of (track ids in first-seen order, array of shape (storms, airports))
+        """
+        if not hurricanes:
+            if record_regions:
+                for region in catalog_regions(self.prune_radius_km):
+                    self.metrics['regions'].setdefault(
+                        region.name, {'evaluated': 0, 'skipped': 0, 'wall_ms': 0.0}
+                    )['skipped'] += 1
+            return [], np.empty((0, len(self.airport_data)))
+        
+        # Distances from every (deduplicated, memoized) position to the
+        # airports of each region whose radius-expanded box contains it;
+        # everything else is out of range and stays inf
+        positions = [(hurricane['lat'], hurricane['lon']) for hurricane in hurricanes]
+        lats = np.array([lat for lat, _ in positions])
+        lons = np.array([lon for _, lon in positions])
+        distances = np.full((len(positions), len(self.airport_data)), np.inf)
+        for region in catalog_regions(self.prune_radius_km):
+            region_stats = (
+                self.metrics['regions'].setdefault(region.name, {'evaluated': 0, 'skipped': 0, 'wall_ms': 0.0})
+                if record_regions else None
+            )
+            inside = np.flatnonzero(region.contains(lats, lons))
+            if not len(inside):
+                if region_stats is not None:
+                    region_stats['skipped'] += 1
+                continue
+            started = time.perf_counter()
+            distances[np.ix_(inside, region.columns)] = self.distance_memo.distances(
+                [positions[i] for i in inside],
+                stats=self.metrics['distance_memo'],
+                region=region
+            )
+            if region_stats is not None:
+                region_stats['evaluated'] += 1
+                region_stats['wall_ms'] += (time.perf_counter() - started) * 1000
+        groups, track_ids = pd.factorize(
+            pd.Series([hurricane['track_id'] for hurricane in hurricanes], dtype=object),
+            use_na_sentinel=False
+        )
+        order = np.argsort(groups, kind='stable')
+        sorted_groups = groups[order]
+        starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        storm_distances = np.minimum.reduceat(distances[order], starts, axis=0)
+        return [None if pd.isna(t) else t for t in track_ids], storm_distances
+    
+    def _min_distances(self, hurricanes: List[Dict[str, Any]]) -> np.ndarray:
+        """Minimum distance from each airport to any hurricane position (inf if none)."""
+        _, storm_distances = self._storm_distances(hurricanes)
+        if not len(storm_distances):
+            return np.full(len(self.airport_data), np.inf)
+        return storm_distances.min(axis=0)
+    
+    def _storm_breakdown(
+        self,
+        hurricanes: List[Dict[str, Any]],
+        track_ids: List[Optional[str]],
+        storm_distances: np.ndarray,
+        daily_volumes: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-storm exposure within the risk radius from the grouped distances.
         
-        daily_travelers = baseline_capacity * multiplier * dow_multiplier
+        Pruned airports are only known to be beyond ``prune_radius_km``, so a
+        storm whose nearest evaluated airport is farther than that (or that
+        missed every region) gets its closest approach from an exhaustive,
+        unpruned lookup of its positions.
+        """
+        within = storm_distances <= self.risk_radius_km
+        travelers = np.where(within, daily_volumes[None, :], 0).sum(axis=1)
+        storms = []
+        for i, track_id in enumerate(track_ids):
+            columns = np.flatnonzero(within[i])
+            nearest = storm_distances[i]
+            if not nearest.min() <= self.prune_radius_km:
+                positions = [
+                    (h['lat'], h['lon']) for h in hurricanes if h['track_id'] == track_id
+                ]
+                nearest = self.distance_memo.distances(
+                    positions, stats=self.metrics['distance_memo']
+                ).min(axis=0)
+            closest = int(nearest.argmin())
+            storms.append({
+                'track_id': track_id,
+                'closest_approach_km': round(float(nearest[closest]), 2),
+                'closest_airport': self.airport_data.iloc[closest]['airport_code'],
+                'total_travelers_at_risk': int(travelers[i]),
+                'airports_affected': len(columns),
+                'airport_codes': [self.airport_data.iloc[c]['airport_code'] for c in columns]
+            })
+        storms.sort(key=lambda x: (x['total_travelers_at_risk'], -x['closest_approach_km']), reverse=True)
+        return storms
+    
+    def _airports_within(
+        self,
+        min_distances: np.ndarray,
+        radius_km: float,
+        travelers_for: Callable[[str], int]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Build airport risk entries for airports within a radius.
         
-        return int(max(0, daily_travelers))
+        Args:
+            min_distances: Minimum hurricane distance per airport
+            radius_km: Exposure radius
+            travelers_for: Returns the travelers exposed at an airport code
+            
+        Returns:
+            Tuple of (airports at risk sorted by travelers, total travelers at risk)
+        """
+        airports_at_risk = []
+        total_travelers_at_risk = 0
+        
+        # Only airports within the radius need further work
+        for column in np.flatnonzero(min_distances <= radius_km):
+            airport = self.airport_data.iloc[column]
+            airport_code = airport['airport_code']
+            min_distance = float(min_distances[column])
+            travelers = travelers_for(airport_code)
+            
+            airports_at_risk.append({
+                'airport_code': airport_code,
+                'airport_name': airport['name'],
+                'travelers_at_risk': travelers,
+                'distance_to_hurricane_km': round(min_distance, 2),
+                'risk_level': self._determine_risk_level(min_distance)
+            })
+            
+            total_travelers_at_risk += travelers
+        
+        # Sort airports by travelers at risk (descending)
+        airports_at_risk.sort(key=lambda x: x['travelers_at_risk'], reverse=True)
+        
+        return airports_at_risk, total_travelers_at_risk
+    
+    def _within(
+        self,
+        candidates: List[Dict[str, Any]],
+        min_distances: np.ndarray,
+        radius_km: float
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Narrow entries built for a larger radius down to ``radius_km`` (order kept)."""
+        airport_index = self.traveler_model.airport_index
+        airports = [
+            airport for airport in candidates
+            if min_distances[airport_index[airport['airport_code']]] <= radius_km
+        ]
+        return airports, sum(airport['travelers_at_risk'] for airport in airports)
+    
+    def _assess_airports(
+        self,
+        hurricanes: List[Dict[str, Any]],
+        travelers_for: Callable[[str], int]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Find airports within the risk radius of any hurricane position."""
+        return self._airports_within(self._min_distances(hurricanes), self.risk_radius_km, travelers_for)
     
-    def calculate_risk_profile(self, hurricane_data: dict, start_date: str, days: int) -> Dict[str, Any]:
+    def _build_time_index(self, data_by_date: dict, date_range: pd.DatetimeIndex) -> Tuple[List[float], List[Dict[str, Any]]]:
+        """
+        Sort every record in the window by valid_time once.
+        
+        Returns:
+            Tuple of (sorted epoch seconds, hurricanes in the same order); records
+            without a usable valid_time are left out of the index
+        """
+        timed = []
+        for date in date_range:
+            date_data = data_by_date.get(date.strftime('%Y-%m-%d'), {})
+            for hurricane in self._parse_hurricane_records(date_data.get('records', [])):
+                valid_time = self._parse_valid_time(hurricane['valid_time'])
+                if valid_time is not None:
+                    timed.append((valid_time.timestamp(), hurricane))
+        
+        timed.sort(key=lambda item: item[0])
+        return [item[0] for item in timed], [item[1] for item in timed]
+    
+    def _calculate_time_windows(
+        self,
+        date: pd.Timestamp,
+        daily_volumes: np.ndarray,
+        resolution_hours: int,
+        times: List[float],
+        hurricanes: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Calculate risk for each sub-daily window of a date from the sorted time index."""
+        day_start = date.tz_localize('UTC') if date.tzinfo is None else date
+        airport_index = self.traveler_model.airport_index
+        windows = []
+        
+        for first_hour in range(0, 24, resolution_hours):
+            window_start = day_start + timedelta(hours=first_hour)
+            window_end = window_start + timedelta(hours=resolution_hours)
+            
+            # Binary search the sorted index instead of re-filtering per window
+            lo = bisect_left(times, window_start.timestamp())
+            hi = bisect_left(times, window_end.timestamp())
+            window_hurricanes = hurricanes[lo:hi]
+            
+            share = float(HOURLY_TRAFFIC_SHARES[first_hour:first_hour + resolution_hours].sum())
+            
+            def travelers_for(airport_code: str) -> int:
+                return int(round(daily_volumes[airport_index[airport_code]] * share))
+            
+            airports_at_risk, total_travelers_at_risk = self._assess_airports(
+                window_hurricanes, travelers_for
+            )
+            
+            windows.append({
+                'window_start': window_start.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'window_end': window_end.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'total_travelers_at_risk': total_travelers_at_risk,
+                'airports_affected': len(airports_at_risk),
+                'airports_at_risk': airports_at_risk,
+                'active_hurricanes': len({h['track_id'] for h in window_hurricanes})
+            })
+        
+        return windows
+    
+    def calculate_risk_profile(
+        self,
+        hurricane_data: dict,
+        start_date: str,
+        days: int,
+        resolution_hours: int = 24,
+        radii_km: Optional[List[float]] = None,
+        risk_breakpoints_km: Optional[List[float]] = None,
+        storm_breakdown: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        timer: Optional[Any] = None
+    ) -> Dict[str, Any]:
         """
         Calculate risk profile for a date range.
         
@@ -101,17 +380,47 @@ class RiskCalculator:
             hurricane_data: Response from weather-lab-data-api with 'data' key
             start_date: Start date string in YYYY-MM-DD format
             days: Number of days to analyze
+            resolution_hours: Sub-daily window size (1, 3, 6 or 12); 24 keeps
+                the daily-only profile
+            radii_km: Extra exposure radii reported per day in
+                'exposure_by_radius'; distances are computed once for all
+            risk_breakpoints_km: [high, medium] thresholds for risk_level
+            storm_breakdown: Add per-storm (track_id) exposure under 'storms'
+            progress: Optional callback receiving (days done, total days)
+            timer: Optional stage timer (``services.profiling.StageTimer``)
+                accumulating wall/CPU time per calculation stage
             
         Returns:
             Dictionary with risk analysis results
         """
+        if resolution_hours not in SUPPORTED_RESOLUTIONS_HOURS:
+            raise ValueError(
+                f"resolution_hours must be one of {SUPPORTED_RESOLUTIONS_HOURS}"
+            )
+        
         date_range = pd.date_range(start=start_date, periods=days, freq='D')
         daily_risk_profiles = []
+        self.metrics = {'distance_memo': {}, 'regions': {}}
+        self.risk_breakpoints_km = tuple(risk_breakpoints_km or DEFAULT_RISK_BREAKPOINTS_KM)
+        radii_km = sorted(set(radii_km or []))
+        exposure_radius_km = max([self.risk_radius_km] + radii_km)
+        self.prune_radius_km = exposure_radius_km
+        
+        stage = timer.stage if timer is not None else _no_stage
         
         # Get daily data from hurricane_data
         data_by_date = hurricane_data.get('data', {})
         
-        for date in date_range:
+        if resolution_hours < 24:
+            with stage('time_index'):
+                times, timed_hurricanes = self._build_time_index(data_by_date, date_range)
+        
+        # Expected travelers for every day and airport of the window, in one step
+        with stage('traveler_volumes'):
+            volumes = self.traveler_model.volume_matrix(start_date, days)
+        airport_index = self.traveler_model.airport_index
+        
+        for day, date in enumerate(date_range):
             date_str = date.strftime('%Y-%m-%d')
             
             # Get hurricane records for this date
@@ -119,56 +428,72 @@ class RiskCalculator:
             records = date_data.get('records', [])
             
             # Parse hurricane positions
-            hurricanes = self._parse_hurricane_records(records)
-            
-            # Initialize daily profile
-            airports_at_risk = []
-            total_travelers_at_risk = 0
-            
-            # Check each airport
-            for _, airport in self.airport_data.iterrows():
-                airport_code = airport['airport_code']
-                airport_name = airport['name']
-                airport_lat = airport['lat']
-                airport_lon = airport['lon']
-                
-                # Find minimum distance to any hurricane
-                min_distance = float('inf')
-                
-                for hurricane in hurricanes:
-                    distance = self._calculate_distance(
-                        airport_lat, airport_lon,
-                        hurricane['lat'], hurricane['lon']
-                    )
-                    min_distance = min(min_distance, distance)
-                
-                # Check if airport is within risk radius
-                if min_distance <= self.risk_radius_km:
-                    # Calculate travelers at risk
-                    travelers = self.calculate_daily_travelers(airport_code, date)
-                    
-                    airports_at_risk.append({
-                        'airport_code': airport_code,
-                        'airport_name': airport_name,
-                        'travelers_at_risk': travelers,
-                        'distance_to_hurricane_km': round(min_distance, 2),
-                        'risk_level': self._determine_risk_level(min_distance)
-                    })
-                    
-                    total_travelers_at_risk += travelers
-            
-            # Sort airports by travelers at risk (descending)
-            airports_at_risk.sort(key=lambda x: x['travelers_at_risk'], reverse=True)
-            
-            daily_risk_profiles.append({
+            with stage('parse'):
+                hurricanes = self._parse_hurricane_records(records)
+            
+            # One distance pass; entries are built once for the largest radius
+            # and every requested radius is a filter over them
+            with stage('distances'):
+                track_ids, storm_distances = self._storm_distances(hurricanes, record_regions=True)
+                min_distances = (
+                    storm_distances.min(axis=0) if track_ids
+                    else np.full(len(self.airport_data), np.inf)
+                )
+            with stage('exposure'):
+                candidates, _ = self._airports_within(
+                    min_distances,
+                    exposure_radius_km,
+                    lambda airport_code: int(volumes[day, airport_index[airport_code]])
+                )
+                airports_at_risk, total_travelers_at_risk = self._within(
+                    candidates, min_distances, self.risk_radius_km
+                )
+            
+            profile = {
                 'date': date_str,
                 'total_travelers_at_risk': total_travelers_at_risk,
                 'airports_affected': len(airports_at_risk),
                 'airports_at_risk': airports_at_risk,
-                'active_hurricanes': len(hurricanes)
-            })
+                'active_hurricanes': len(track_ids)
+            }
+            
+            if storm_breakdown:
+                with stage('storms'):
+                    profile['storms'] = self._storm_breakdown(
+                        hurricanes, track_ids, storm_distances, volumes[day]
+                    )
+            
+            if radii_km:
+                with stage('exposure_by_radius'):
+                    profile['exposure_by_radius'] = []
+                    for radius_km in radii_km:
+                        radius_airports, radius_travelers = self._within(candidates, min_distances, radius_km)
+                        profile['exposure_by_radius'].append({
+                            'radius_km': radius_km,
+                            'total_travelers_at_risk': radius_travelers,
+                            'airports_affected': len(radius_airports),
+                            'airports_at_risk': radius_airports
+                        })
+            
+            if resolution_hours < 24:
+                with stage('time_windows'):
+                    profile['time_windows'] = self._calculate_time_windows(
+                        date, volumes[day], resolution_hours, times, timed_hurricanes
+                    )
+            
+            daily_risk_profiles.append(profile)
+            
+            if progress is not None:
+                progress(day + 1, days)
+        
+        memo_stats = self.metrics['distance_memo']
+        lookups = memo_stats.get('hits', 0) + memo_stats.get('misses', 0)
+        memo_stats['hit_rate'] = round(memo_stats['hits'] / lookups, 4) if lookups else 0.0
+        memo_stats['lifetime_hit_rate'] = self.distance_memo.stats()['hit_rate']
+        for region_stats in self.metrics['regions'].values():
+            region_stats['wall_ms'] = round(region_stats['wall_ms'], 3)
         
         return {
-            'daily_risk': daily_risk_profiles
+            'daily_risk': daily_risk_profiles,
+            'metrics': self.metrics
         }
-
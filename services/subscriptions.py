@@ -0,0 +1,191 @@
+"""
+Server-push risk updates for subscribed analysis windows
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Set, Tuple
+
+from core.config import settings
+from services.data_client import fetch_hurricane_data_range
+from services.etag import compute_etag
+from services.risk_calculator import RiskCalculator
+
+logger = logging.getLogger(__name__)
+
+WindowKey = Tuple[str, int, int]
+FetchFn = Callable[[str, int], Awaitable[Dict[str, Any]]]
+
+
+class SubscriptionLimitReached(Exception):
+    """Raised when a new window would exceed the per-worker window limit."""
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """A connected client listening to one analysis window."""
+    airports: Optional[Set[str]] = None
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    last_sent: Dict[str, dict] = field(default_factory=dict)
+
+    def _filter(self, profile: dict) -> dict:
+        """Restrict a daily profile to the subscriber's airports."""
+        if not self.airports:
+            return profile
+        airports_at_risk = [
+            airport for airport in profile['airports_at_risk']
+            if airport['airport_code'] in self.airports
+        ]
+        return {
+            **profile,
+            'airports_at_risk': airports_at_risk,
+            'airports_affected': len(airports_at_risk),
+            'total_travelers_at_risk': sum(a['travelers_at_risk'] for a in airports_at_risk),
+        }
+
+    def offer(self, profiles: List[dict]) -> None:
+        """Queue the profiles that changed from what this subscriber last received."""
+        for profile in profiles:
+            filtered = self._filter(profile)
+            if self.last_sent.get(filtered['date']) == filtered:
+                continue
+            self.last_sent[filtered['date']] = filtered
+            self.queue.put_nowait(filtered)
+
+
+@dataclass(eq=False)
+class WindowState:
+    """Shared state for every subscriber of one window."""
+    subscribers: Set[Subscriber] = field(default_factory=set)
+    profiles: Dict[str, dict] = field(default_factory=dict)
+    etag: Optional[str] = None
+    task: Optional[asyncio.Task] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class SubscriptionHub:
+    """
+    Poll upstream once per subscribed window and fan results out to subscribers.
+
+    Each window (start date, days, resolution) has a single polling task no
+    matter how many clients listen to it. The risk profile is only recomputed
+    when the window's input ETag changes, and only daily profiles that differ
+    from the previous computation are pushed. Pollers bypass admission
+    control, so the number of distinct windows is capped at ``max_windows``.
+    """
+
+    def __init__(
+        self,
+        fetch: FetchFn = fetch_hurricane_data_range,
+        poll_interval: Optional[float] = None,
+        calculator_factory: Callable[[], RiskCalculator] = RiskCalculator,
+        max_windows: Optional[int] = None
+    ):
+        self.fetch = fetch
+        self.poll_interval = poll_interval or settings.SUBSCRIPTION_POLL_SECONDS
+        self.calculator_factory = calculator_factory
+        self.max_windows = max_windows if max_windows is not None else settings.SUBSCRIPTION_MAX_WINDOWS
+        self.windows: Dict[WindowKey, WindowState] = {}
+
+    def subscribe(
+        self,
+        start_date: str,
+        days: int,
+        resolution_hours: int = 24,
+        airports: Optional[Set[str]] = None
+    ) -> Tuple[WindowKey, Subscriber]:
+        """
+        Register a subscriber, starting the window's poller if needed.
+
+        Raises:
+            SubscriptionLimitReached: When ``max_windows`` windows are already
+                polled and the requested one is not among them
+        """
+        key = (start_date, days, resolution_hours)
+        state = self.windows.get(key)
+        if state is None:
+            if len(self.windows) >= self.max_windows:
+                raise SubscriptionLimitReached(f"{self.max_windows} subscription windows already active")
+            state = self.windows[key] = WindowState()
+            state.task = asyncio.create_task(self._poll(key, state))
+
+        subscriber = Subscriber(airports=airports)
+        state.subscribers.add(subscriber)
+
+        # Late joiners get the current snapshot straight away
+        if state.profiles:
+            subscriber.offer(list(state.profiles.values()))
+        return key, subscriber
+
+    def unsubscribe(self, key: WindowKey, subscriber: Subscriber) -> None:
+        """Remove a subscriber, stopping the window's poller when it was the last."""
+        state = self.windows.get(key)
+        if state is None:
+            return
+        state.subscribers.discard(subscriber)
+        if not state.subscribers:
+            del self.windows[key]
+            if state.task:
+                state.task.cancel()
+
+    async def refresh(self, key: WindowKey, state: WindowState) -> List[dict]:
+        """
+        Fetch the window once and recompute if its inputs changed.
+
+        Returns:
+            Daily profiles that changed since the previous computation
+        """
+        async with state.lock:
+            return await self._refresh_locked(key, state)
+
+    async def _refresh_locked(self, key: WindowKey, state: WindowState) -> List[dict]:
+        """Refresh body; callers hold the window lock."""
+        start_date, days, resolution_hours = key
+        hurricane_data = await self.fetch(start_date, days)
+
+        etag = compute_etag(
+            hurricane_data, start_date, days, settings.RISK_RADIUS_KM,
+            resolution_hours=resolution_hours
+        )
+        if etag == state.etag:
+            return []
+
+        calculator = self.calculator_factory()
+        result = await asyncio.to_thread(
+            calculator.calculate_risk_profile,
+            hurricane_data, start_date, days,
+            resolution_hours=resolution_hours
+        )
+
+        changed = [
+            profile for profile in result['daily_risk']
+            if state.profiles.get(profile['date']) != profile
+        ]
+        state.etag = etag
+        state.profiles = {profile['date']: profile for profile in result['daily_risk']}
+
+        for subscriber in state.subscribers:
+            subscriber.offer(changed)
+        return changed
+
+    async def _poll(self, key: WindowKey, state: WindowState) -> None:
+        """Refresh a window until its last subscriber leaves."""
+        while True:
+            try:
+                await self.refresh(key, state)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Subscription refresh failed for window %s", key)
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self) -> None:
+        """Stop every poller (application shutdown)."""
+        tasks = [state.task for state in self.windows.values() if state.task]
+        self.windows.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+subscription_hub = SubscriptionHub()
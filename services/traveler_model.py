@@ -0,0 +1,140 @@
+"""
+Traveler volume model: days x airports passenger matrix for an analysis window
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.airports import MAJOR_AIRPORTS, AIRPORT_CATALOG_VERSION
+from core.config import settings
+
+# Seasonality by month (Jan..Dec): spring/summer peak, holiday season, base
+MONTH_MULTIPLIERS = np.array([1.1, 1.0, 1.2, 1.2, 1.2, 1.2, 1.2, 1.2, 1.0, 1.0, 1.1, 1.1])
+
+# Day of week (Mon..Sun): Monday/Tuesday trough, Friday-Sunday peak
+WEEKDAY_MULTIPLIERS = np.array([0.9, 0.9, 1.0, 1.0, 1.2, 1.2, 1.2])
+
+
+@dataclass
+class TravelCalendar:
+    """
+    Optional calendar adjustments loaded from a JSON file.
+
+    Format::
+
+        {
+            "holidays": {"2024-11-27": 1.35, "2024-11-28": 0.8},
+            "seasonal": {"MIA": [1.3, 1.35, 1.3, 1.2, 1.0, 0.9, 0.95, 0.9, 0.8, 0.9, 1.0, 1.2]}
+        }
+
+    ``holidays`` multiplies every airport's volume on a date; ``seasonal``
+    replaces the default month curve for individual airports.
+    """
+    holidays: Dict[str, float] = field(default_factory=dict)
+    seasonal: Dict[str, List[float]] = field(default_factory=dict)
+    version: str = "default"
+
+    @classmethod
+    def load(cls, path: str) -> "TravelCalendar":
+        """Load and validate a calendar file."""
+        with open(path, 'rb') as f:
+            raw = f.read()
+        payload = json.loads(raw)
+        seasonal = payload.get('seasonal', {}) or {}
+        for code, curve in seasonal.items():
+            if len(curve) != 12:
+                raise ValueError(f"Seasonal curve for {code} must have 12 monthly values")
+        return cls(
+            holidays={date: float(value) for date, value in (payload.get('holidays', {}) or {}).items()},
+            seasonal={code: [float(v) for v in curve] for code, curve in seasonal.items()},
+            version=hashlib.sha256(raw).hexdigest()[:12]
+        )
+
+
+class TravelerVolumeModel:
+    """
+    Expected daily travelers for every airport over a date window.
+
+    All calendar work happens once per (window, catalog, calendar) in a single
+    vectorized step; the resulting read-only matrix is cached and shared, so
+    the per-airport, per-day lookup in the risk calculation is an array index.
+    """
+
+    def __init__(self, airports: dict, calendar: Optional[TravelCalendar] = None,
+                 catalog_version: str = AIRPORT_CATALOG_VERSION, max_windows: int = 256):
+        self.calendar = calendar or TravelCalendar()
+        self.catalog_version = catalog_version
+        self.airport_codes = list(airports)
+        self.airport_index = {code: i for i, code in enumerate(self.airport_codes)}
+        self.baselines = np.array(
+            [airports[code]['daily_passengers'] for code in self.airport_codes], dtype=float
+        )
+
+        # airports x 12 month curves, with per-airport overrides from the calendar
+        self.seasonal = np.tile(MONTH_MULTIPLIERS, (len(self.airport_codes), 1))
+        for code, curve in self.calendar.seasonal.items():
+            if code in self.airport_index:
+                self.seasonal[self.airport_index[code]] = curve
+
+        self.max_windows = max_windows
+        self._matrices: "OrderedDict[Tuple[str, int, str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build_matrix(self, start_date: str, days: int) -> np.ndarray:
+        """Compute the days x airports volume matrix."""
+        dates = pd.date_range(start=start_date, periods=days, freq='D')
+        month = self.seasonal[:, dates.month.values - 1].T
+        weekday = WEEKDAY_MULTIPLIERS[dates.dayofweek.values][:, None]
+        volumes = self.baselines[None, :] * month * weekday
+        if self.calendar.holidays:
+            holiday = np.array(
+                [self.calendar.holidays.get(date.strftime('%Y-%m-%d'), 1.0) for date in dates]
+            )
+            volumes = volumes * holiday[:, None]
+        matrix = np.maximum(volumes, 0).astype(np.int64)
+        matrix.setflags(write=False)
+        return matrix
+
+    def volume_matrix(self, start_date: str, days: int) -> np.ndarray:
+        """
+        Expected travelers per day and airport.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            days: Number of days in the window
+
+        Returns:
+            Read-only int64 array of shape (days, airports), columns ordered
+            as ``airport_codes``
+        """
+        key = (start_date, days, self.catalog_version, self.calendar.version)
+        with self._lock:
+            matrix = self._matrices.get(key)
+            if matrix is not None:
+                self._matrices.move_to_end(key)
+                return matrix
+
+        matrix = self._build_matrix(start_date, days)
+        with self._lock:
+            self._matrices[key] = matrix
+            while len(self._matrices) > self.max_windows:
+                self._matrices.popitem(last=False)
+        return matrix
+
+
+_model: Optional[TravelerVolumeModel] = None
+
+
+def get_traveler_model() -> TravelerVolumeModel:
+    """Process-wide traveler model, loading ``TRAVEL_CALENDAR_PATH`` on first use."""
+    global _model
+    if _model is None:
+        calendar = TravelCalendar.load(settings.TRAVEL_CALENDAR_PATH) if settings.TRAVEL_CALENDAR_PATH else None
+        _model = TravelerVolumeModel(MAJOR_AIRPORTS, calendar)
+    return _model
@@ -0,0 +1,364 @@
+"""
+Content negotiation and compression for request and response bodies
+"""
+import gzip
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from core.config import settings
+
+try:
+    import msgpack
+except ImportError:  # optional: pip install msgpack
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional: pip install cbor2
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+# Alternative media types clients send for the same formats
+_MEDIA_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+
+class WireFormatError(Exception):
+    """Request body that cannot be decoded (mapped to an HTTP error response)."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def available_formats() -> List[str]:
+    """Body formats this process can read and write, JSON first."""
+    formats = [JSON]
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    if cbor2 is not None:
+        formats.append(CBOR)
+    return formats
+
+
+def available_encodings() -> List[str]:
+    """Content codings supported in both directions, most preferred first."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def _media_type(value: str) -> str:
+    media_type = value.split(';')[0].strip().lower()
+    return _MEDIA_ALIASES.get(media_type, media_type)
+
+
+def _parse_qualities(value: str) -> List[Tuple[str, float]]:
+    """Parse an Accept / Accept-Encoding header into (token, q) pairs."""
+    items = []
+    for part in value.split(','):
+        token, *params = [p.strip() for p in part.split(';')]
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        items.append((token.lower(), q))
+    return items
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """Pick the response body format from an Accept header (JSON by default)."""
+    if not accept:
+        return JSON
+    best, best_q = JSON, 0.0
+    for token, q in _parse_qualities(accept):
+        media_type = _MEDIA_ALIASES.get(token, token)
+        if media_type in available_formats() and q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the response content coding from Accept-Encoding (None = identity)."""
+    if not accept_encoding:
+        return None
+    qualities = dict(_parse_qualities(accept_encoding))
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = qualities.get(encoding, qualities.get('x-gzip' if encoding == 'gzip' else encoding,
+                                                  qualities.get('*', 0.0)))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _gunzip(body: bytes, max_bytes: int) -> bytes:
+    """Decompress every gzip member (a body may hold several), bounded by max_bytes."""
+    chunks, size = [], 0
+    while True:
+        decompressor = zlib.decompressobj(wbits=31)
+        chunk = decompressor.decompress(body, max_bytes + 1 - size)
+        size += len(chunk)
+        if size > max_bytes:
+            raise WireFormatError(413, "Decompressed request body too large")
+        if not decompressor.eof:
+            raise WireFormatError(400, "Truncated gzip request body")
+        chunks.append(chunk)
+        body = decompressor.unused_data
+        if not body:
+            return b''.join(chunks)
+
+
+def _unzstd(body: bytes, max_bytes: int) -> bytes:
+    """Decompress every zstd frame, bounded by max_bytes."""
+    # The stream reader stops after max_bytes + 1 bytes of output, so the
+    # frame-by-frame pass below never decompresses an oversized body
+    with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body), read_across_frames=True) as reader:
+        if len(reader.read(max_bytes + 1)) > max_bytes:
+            raise WireFormatError(413, "Decompressed request body too large")
+    chunks = []
+    while True:
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        chunks.append(decompressor.decompress(body))
+        if not decompressor.eof:
+            raise WireFormatError(400, "Truncated zstd request body")
+        body = decompressor.unused_data
+        if not body:
+            return b''.join(chunks)
+
+
+def decompress(body: bytes, encoding: str, max_bytes: int) -> bytes:
+    """
+    Undo a request Content-Encoding, refusing output beyond ``max_bytes``.
+
+    Multi-member gzip and multi-frame zstd bodies are decoded in full.
+
+    Raises:
+        WireFormatError: 415 for unsupported codings, 400 for corrupt or
+            truncated data, 413 when the decompressed body is too large
+    """
+    try:
+        if encoding in ('gzip', 'x-gzip'):
+            return _gunzip(body, max_bytes)
+        if encoding == 'zstd' and zstandard is not None:
+            return _unzstd(body, max_bytes)
+    except WireFormatError:
+        raise
+    except Exception as e:
+        raise WireFormatError(400, f"Invalid {encoding} request body: {e}")
+    raise WireFormatError(415, f"Unsupported Content-Encoding: {encoding}")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def decode_body(body: bytes, media_type: str) -> Any:
+    """Decode a MessagePack or CBOR request body."""
+    try:
+        if media_type == MSGPACK:
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        return cbor2.loads(body)
+    except Exception as e:
+        raise WireFormatError(400, f"Invalid {media_type} request body: {e}")
+
+
+def _json_default(value: Any) -> Any:
+    # CBOR decodes tagged times (the natural encoding of valid_time) to datetimes
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} values have no JSON equivalent")
+
+
+def to_json(document: Any, media_type: str) -> bytes:
+    """
+    Re-encode a decoded MessagePack/CBOR document as JSON.
+
+    Raises:
+        WireFormatError: 400 for values JSON cannot represent (e.g. binary)
+    """
+    try:
+        return json.dumps(document, separators=(',', ':'), default=_json_default).encode('utf-8')
+    except (TypeError, ValueError) as e:
+        raise WireFormatError(400, f"Invalid {media_type} request body: {e}")
+
+
+def encode_body(document: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK:
+        return msgpack.packb(document, use_bin_type=True)
+    return cbor2.dumps(document)
+
+
+def _weak(etag: str) -> str:
+    """Weak form of an ETag; a transformed body keeps the same semantics."""
+    return etag if etag.startswith('W/') else f'W/{etag}'
+
+
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class WireFormatMiddleware:
+    """
+    ASGI middleware translating bodies between JSON and compact wire formats.
+
+    Requests with ``Content-Encoding: gzip|zstd`` are decompressed and
+    MessagePack/CBOR bodies are decoded, so handlers and validation only ever
+    see JSON. JSON responses are re-encoded to the format chosen from
+    ``Accept`` and compressed per ``Accept-Encoding`` when at least
+    ``RESPONSE_COMPRESSION_MIN_BYTES`` long. Schemas are unchanged; only the
+    representation differs, so negotiated responses carry a weak ETag.
+    Other responses (event streams, files) pass through untouched.
+    """
+
+    def __init__(self, app: Callable, min_compress_bytes: Optional[int] = None,
+                 max_request_bytes: Optional[int] = None):
+        self.app = app
+        self.min_compress_bytes = (
+            min_compress_bytes if min_compress_bytes is not None
+            else settings.RESPONSE_COMPRESSION_MIN_BYTES
+        )
+        self.max_request_bytes = (
+            max_request_bytes if max_request_bytes is not None
+            else settings.MAX_REQUEST_BODY_BYTES
+        )
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        encoding = headers.get('content-encoding', '').strip().lower()
+        media_type = _media_type(headers.get('content-type', ''))
+        if encoding not in ('', 'identity') or media_type in (MSGPACK, CBOR):
+            try:
+                scope, receive = await self._decode_request(scope, receive, encoding, media_type)
+            except WireFormatError as e:
+                response = JSONResponse({'detail': e.detail}, status_code=e.status_code)
+                await response(scope, receive, send)
+                return
+
+        response_format = negotiate_format(headers.get('accept'))
+        response_encoding = negotiate_encoding(headers.get('accept-encoding'))
+        await self.app(scope, receive, self._wrap_send(send, response_format, response_encoding))
+
+    async def _decode_request(self, scope: Dict[str, Any], receive: Receive, encoding: str,
+                              media_type: str) -> Tuple[Dict[str, Any], Receive]:
+        """Buffer, decompress and decode the request body into JSON."""
+        if media_type in (MSGPACK, CBOR) and media_type not in available_formats():
+            raise WireFormatError(415, f"Unsupported Content-Type: {media_type}")
+
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > self.max_request_bytes:
+                raise WireFormatError(413, "Request body too large")
+            chunks.append(chunk)
+            more_body = message.get('more_body', False)
+        body = b''.join(chunks)
+
+        if encoding not in ('', 'identity'):
+            body = decompress(body, encoding, self.max_request_bytes)
+        if media_type in (MSGPACK, CBOR):
+            body = to_json(decode_body(body, media_type), media_type)
+            media_type = JSON
+
+        headers = [
+            (name, value) for name, value in scope['headers']
+            if name not in (b'content-encoding', b'content-length', b'content-type')
+        ]
+        headers.append((b'content-type', media_type.encode('latin-1')))
+        headers.append((b'content-length', str(len(body)).encode('latin-1')))
+        scope = {**scope, 'headers': headers}
+
+        sent = False
+
+        async def replay() -> Dict[str, Any]:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        return scope, replay
+
+    def _wrap_send(self, send: Send, response_format: str, response_encoding: Optional[str]) -> Send:
+        """Buffer JSON responses and re-encode/compress them on the last body chunk."""
+        start: Optional[Dict[str, Any]] = None
+        chunks: List[bytes] = []
+        passthrough = False
+        # Any non-identity representation gets a weak ETag, whether or not this
+        # particular body ends up above the compression threshold, so 200 and
+        # 304 responses for the same negotiation agree
+        negotiated = response_format != JSON or response_encoding is not None
+
+        async def wrapped(message: Dict[str, Any]) -> None:
+            nonlocal start, passthrough
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(raw=list(message.get('headers', [])))
+                not_modified = message['status'] == 304
+                if not not_modified and (
+                    _media_type(headers.get('content-type', '')) != JSON or 'content-encoding' in headers
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                headers.add_vary_header('Accept')
+                headers.add_vary_header('Accept-Encoding')
+                if negotiated and 'etag' in headers:
+                    headers['etag'] = _weak(headers['etag'])
+                if not_modified:
+                    passthrough = True
+                    await send({**message, 'headers': headers.raw})
+                    return
+                start = {**message, 'headers': headers.raw}
+                return
+
+            if passthrough or message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            chunks.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+
+            body = b''.join(chunks)
+            headers = MutableHeaders(raw=start['headers'])
+            if body and response_format != JSON:
+                body = encode_body(json.loads(body), response_format)
+                headers['content-type'] = response_format
+            if body and response_encoding and len(body) >= self.min_compress_bytes:
+                body = compress(body, response_encoding)
+                headers['content-encoding'] = response_encoding
+            headers['content-length'] = str(len(body))
+            await send({**start, 'headers': headers.raw})
+            await send({'type': 'http.response.body', 'body': body, 'more_body': False})
+
+        return wrapped
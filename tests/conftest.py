@@ -5,6 +5,15 @@ from unittest.mock import AsyncMock, MagicMock
 from typing import Dict, Any
 
 from main import app
+from services.cache import get_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty upstream/result cache."""
+    get_cache().clear()
+    yield
+    get_cache().clear()
 
 
 @pytest.fixture
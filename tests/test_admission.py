@@ -0,0 +1,82 @@
+"""Tests for admission control"""
+import asyncio
+
+import pytest
+
+from services.admission import AdmissionController, AdmissionRejected, admission_controller, estimate_cost
+
+
+def _controller(**overrides):
+    options = dict(
+        max_inflight_cost=100,
+        interactive_cost_threshold=10,
+        queue_limits={"interactive": 2, "bulk": 1},
+        queue_timeout=0.2,
+        retry_after=7
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_estimate_cost_scales_with_days_records_and_airports():
+    """Test cost is days x records per day x airports."""
+    assert estimate_cost(days=3, records=30, airports=33) == 3 * 10 * 33
+    assert estimate_cost(days=2, records=0, airports=33) == 2 * 1 * 33
+
+
+async def test_interactive_requests_overtake_queued_bulk():
+    """Test a cheap request is dispatched before an earlier queued heavy one."""
+    controller = _controller()
+    order = []
+    
+    async def run(name, cost, hold):
+        async with controller.admit(cost):
+            order.append(name)
+            await asyncio.sleep(hold)
+    
+    first = asyncio.create_task(run("heavy-1", 95, 0.05))
+    await asyncio.sleep(0)
+    bulk = asyncio.create_task(run("heavy-2", 50, 0))
+    await asyncio.sleep(0)
+    cheap = asyncio.create_task(run("cheap", 10, 0))
+    await asyncio.gather(first, bulk, cheap)
+    
+    assert order == ["heavy-1", "cheap", "heavy-2"]
+    assert controller.inflight_cost == 0
+
+
+async def test_full_queue_rejects_with_429_and_timeout_with_503():
+    """Test over-budget requests fail fast with Retry-After."""
+    controller = _controller()
+    
+    async with controller.admit(100):
+        waiting = asyncio.create_task(controller.admit(50).__aenter__())
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as full:
+            async with controller.admit(50):
+                pass
+        assert full.value.status_code == 429
+        assert full.value.retry_after == 7
+        
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await waiting
+        assert timed_out.value.status_code == 503
+    
+    assert controller.inflight_cost == 0
+
+
+def test_endpoint_returns_429_with_retry_after(client, mock_hurricane_data_range, monkeypatch):
+    """Test the analyze endpoints surface admission rejections as HTTP errors."""
+    monkeypatch.setattr(admission_controller, "inflight_cost", admission_controller.max_inflight_cost)
+    monkeypatch.setattr(admission_controller, "queue_limits", {"interactive": 0, "bulk": 0})
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        json={"start_date": "2024-10-23", "days": 3, "data": mock_hurricane_data_range["data"]}
+    )
+    
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == str(admission_controller.retry_after)
+    # Cheap endpoints are never subject to admission control
+    assert client.get("/api/v1/health").status_code == 200
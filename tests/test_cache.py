@@ -0,0 +1,98 @@
+"""Tests for cache backends"""
+import asyncio
+import time
+
+import pytest
+
+from services.cache import MemoryCache, SQLiteCache
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_cache(request, tmp_path):
+    """Factory building either backend with the given bounds."""
+    def factory(**kwargs):
+        if request.param == "sqlite":
+            return SQLiteCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+        kwargs.pop("max_bytes", None)
+        kwargs.pop("touch_interval", None)
+        return MemoryCache(**kwargs)
+    return factory
+
+
+def test_round_trip_and_expiry(make_cache):
+    """Test values are returned until their TTL passes."""
+    cache = make_cache()
+    cache.set("a", {"x": [1, 2]}, ttl=60)
+    cache.set("b", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") == {"x": [1, 2]}
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_entry_bound_evicts_least_recently_used(make_cache):
+    """Test the oldest untouched entry is evicted once over the entry bound."""
+    cache = make_cache(max_entries=2, touch_interval=0)
+    cache.set("a", 1)
+    time.sleep(0.001)
+    cache.set("b", 2)
+    time.sleep(0.001)
+    assert cache.get("a") == 1
+    time.sleep(0.001)
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_version_namespaces_entries(tmp_path):
+    """Test a new cache version does not see entries written by an older one."""
+    path = str(tmp_path / "cache.sqlite3")
+    SQLiteCache(path, version="1").set("k", "old")
+    assert SQLiteCache(path, version="2").get("k") is None
+    assert SQLiteCache(path, version="1").get("k") == "old"
+
+
+def test_sqlite_byte_bound(tmp_path):
+    """Test the SQLite backend stays within its byte budget."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_bytes=100)
+    cache.set("a", "x" * 60)
+    time.sleep(0.001)
+    cache.set("b", "y" * 60)
+    assert cache.get("a") is None
+    assert cache.get("b") == "y" * 60
+
+
+def test_sqlite_hits_do_not_write(tmp_path):
+    """Test reads only refresh recency once per touch interval."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), touch_interval=60)
+    cache.set("a", 1)
+    conn = cache._connection()
+    before = conn.total_changes
+    
+    assert cache.get("a") == 1 and cache.get("a") == 1
+    assert conn.total_changes == before
+    
+    cache.touch_interval = 0
+    cache.get("a")
+    assert conn.total_changes == before + 1
+
+
+async def test_async_access_runs_blocking_backends_in_a_thread(tmp_path, monkeypatch):
+    """Test aget/aset move SQLite calls off the event loop."""
+    calls = []
+    to_thread = asyncio.to_thread
+    
+    async def recording_to_thread(func, *args):
+        calls.append(func.__name__)
+        return await to_thread(func, *args)
+    
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+    await cache.aset("a", {"x": 1})
+    assert await cache.aget("a") == {"x": 1}
+    assert calls == ["set", "get"]
+    
+    memory = MemoryCache()
+    await memory.aset("a", 1)
+    assert await memory.aget("a") == 1
+    assert calls == ["set", "get"]
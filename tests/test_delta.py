@@ -0,0 +1,35 @@
+"""Tests for result snapshots and deltas"""
+from services.delta import build_snapshot, diff_snapshots
+
+
+def _airport(code, travelers, distance, level="low"):
+    return {
+        "airport_code": code,
+        "airport_name": code,
+        "travelers_at_risk": travelers,
+        "distance_to_hurricane_km": distance,
+        "risk_level": level
+    }
+
+
+def test_diff_reports_added_removed_and_changed_airports():
+    """Test deltas classify airport entries and omit unchanged days."""
+    before = build_snapshot([
+        {"date": "2024-10-23", "airports_at_risk": [_airport("MIA", 100, 40.0, "high")]},
+        {"date": "2024-10-24", "airports_at_risk": [_airport("MIA", 100, 80.0), _airport("FLL", 50, 90.0)]},
+    ])
+    after = build_snapshot([
+        {"date": "2024-10-23", "airports_at_risk": [_airport("MIA", 100, 40.0, "high")]},
+        {"date": "2024-10-24", "airports_at_risk": [_airport("MIA", 100, 60.0), _airport("PBI", 30, 120.0)]},
+        {"date": "2024-10-25", "airports_at_risk": []},
+    ])
+    
+    deltas = diff_snapshots(before, after)
+    
+    assert len(deltas) == 1
+    delta = deltas[0]
+    assert delta["date"] == "2024-10-24"
+    assert [a["airport_code"] for a in delta["added"]] == ["PBI"]
+    assert delta["removed"] == ["FLL"]
+    assert [a["distance_to_hurricane_km"] for a in delta["changed"]] == [60.0]
+    assert delta["total_travelers_at_risk"] == 130
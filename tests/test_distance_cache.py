@@ -0,0 +1,39 @@
+"""Tests for the distance memo"""
+import pytest
+from geopy.distance import geodesic
+
+from core.airports import MAJOR_AIRPORTS
+from services.distance_cache import DistanceMemo
+
+
+def test_quantized_positions_share_entries():
+    """Test nearby positions resolve to one memo entry and duplicates are computed once."""
+    memo = DistanceMemo(MAJOR_AIRPORTS, precision_deg=0.01)
+    stats = {}
+    
+    matrix = memo.distances([(25.5, -80.3), (25.501, -80.3021), (25.5, -80.3)], stats=stats)
+    
+    assert matrix.shape == (3, len(MAJOR_AIRPORTS))
+    assert stats == {"positions": 3, "unique_positions": 1, "hits": 0, "misses": 1}
+    mia = memo.airport_codes.index("MIA")
+    expected = geodesic((25.7959, -80.2870), (25.5, -80.3)).kilometers
+    assert matrix[1, mia] == pytest.approx(expected, abs=1.0)
+    
+    # A later request (e.g. the next forecast cycle) hits the memo
+    memo.distances([(25.4999, -80.3)], stats=stats)
+    assert stats["hits"] == 1
+    assert memo.stats()["hit_rate"] == 0.5
+
+
+def test_memo_is_bounded():
+    """Test least-recently-used entries are evicted beyond max_entries."""
+    memo = DistanceMemo(MAJOR_AIRPORTS, precision_deg=0.1, max_entries=2)
+    memo.distances([(20.0, -70.0), (21.0, -70.0), (22.0, -70.0)])
+    assert memo.stats()["entries"] == 2
+
+
+def test_exact_mode_without_quantization():
+    """Test a precision of 0 keys on exact coordinates."""
+    memo = DistanceMemo(MAJOR_AIRPORTS, precision_deg=0)
+    memo.distances([(25.5, -80.3), (25.5001, -80.3)])
+    assert memo.stats()["misses"] == 2
@@ -0,0 +1,30 @@
+"""Tests for content-derived ETags"""
+from services.etag import compute_etag, etag_matches
+
+
+def test_etag_ignores_record_order_and_out_of_window_dates(mock_hurricane_data_range):
+    """Test the ETag depends only on the normalized records inside the window."""
+    etag = compute_etag(mock_hurricane_data_range, "2024-10-23", 2, 160.9)
+    
+    reordered = {"data": {
+        "2024-10-24": mock_hurricane_data_range["data"]["2024-10-24"],
+        "2024-10-23": {"records": list(reversed(mock_hurricane_data_range["data"]["2024-10-23"]["records"]))},
+        "2024-12-01": {"records": [{"lat": 1.0, "lon": 2.0}]},
+    }}
+    assert compute_etag(reordered, "2024-10-23", 2, 160.9) == etag
+
+
+def test_etag_changes_with_window_and_radius(mock_hurricane_data_range):
+    """Test the ETag changes when any analysis parameter changes."""
+    etag = compute_etag(mock_hurricane_data_range, "2024-10-23", 3, 160.9)
+    assert compute_etag(mock_hurricane_data_range, "2024-10-23", 2, 160.9) != etag
+    assert compute_etag(mock_hurricane_data_range, "2024-10-23", 3, 100.0) != etag
+
+
+def test_etag_matches_header_forms():
+    """Test If-None-Match parsing for lists, weak tags and wildcards."""
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches('"x"', '"abc"')
+    assert not etag_matches(None, '"abc"')
@@ -0,0 +1,76 @@
+"""Tests for the background job API"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import services.jobs as jobs_module
+from models.requests import RiskAnalysisJobRequest, RiskAnalysisWithDataRequest
+from services.jobs import JobManager, JobQueueFull, JobStore, run_job
+
+
+@pytest.fixture
+def job_manager(tmp_path, monkeypatch):
+    """Job manager running jobs on a thread pool with a temporary store."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    manager = JobManager(str(tmp_path / "jobs.sqlite3"), executor=executor)
+    monkeypatch.setattr(jobs_module, "_manager", manager)
+    yield manager
+    executor.shutdown(wait=True)
+
+
+def test_job_lifecycle(client, job_manager, mock_hurricane_data_range):
+    """Test submitting a job, polling it and fetching its result."""
+    response = client.post(
+        "/api/v1/jobs",
+        json={"start_date": "2024-10-23", "days": 3, "data": mock_hurricane_data_range["data"]}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["result_url"].endswith(f"/api/v1/jobs/{job['job_id']}/result")
+    
+    job_manager.executor.shutdown(wait=True)
+    
+    status = client.get(f"/api/v1/jobs/{job['job_id']}").json()
+    assert status["status"] == "succeeded"
+    assert status["progress"] == {"days_done": 3, "days_total": 3}
+    
+    result = client.get(f"/api/v1/jobs/{job['job_id']}/result")
+    assert result.status_code == 200
+    data = result.json()
+    assert data["meta"]["job_id"] == job["job_id"]
+    assert [day["date"] for day in data["daily_risk"]] == ["2024-10-23", "2024-10-24", "2024-10-25"]
+
+
+def test_unknown_and_unfinished_jobs(client, job_manager):
+    """Test 404 for unknown jobs and 409 for results that are not ready."""
+    assert client.get("/api/v1/jobs/missing").status_code == 404
+    job_manager.store.save({
+        "job_id": "pending", "status": "running", "submitted_at": "2024-10-23T00:00:00Z",
+        "start_date": "2024-10-23", "days": 60, "progress": {"days_done": 10, "days_total": 60}
+    })
+    assert client.get("/api/v1/jobs/pending/result").status_code == 409
+
+
+def test_failed_job_records_error(tmp_path):
+    """Test a job that raises is stored as failed with its error."""
+    store_path = str(tmp_path / "jobs.sqlite3")
+    run_job("bad", store_path, {"start_date": "not-a-date", "days": 1, "options": {}, "data": {}})
+    job = JobStore(store_path).get("bad")
+    assert job["status"] == "failed"
+    assert job["error"]
+
+
+def test_pending_limit(tmp_path):
+    """Test submissions beyond max_pending are refused."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    manager = JobManager(str(tmp_path / "jobs.sqlite3"), executor=executor, max_pending=0)
+    with pytest.raises(JobQueueFull):
+        manager.submit("2024-10-23", 1, {})
+    executor.shutdown()
+
+
+def test_job_request_has_no_delta_option():
+    """Test previous_token is only offered by the synchronous analyze requests."""
+    assert "previous_token" not in RiskAnalysisJobRequest.model_fields
+    assert "previous_token" in RiskAnalysisWithDataRequest.model_fields
@@ -0,0 +1,41 @@
+"""Tests for the load-testing harness"""
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from loadtest.load_generator import build_request, percentile, run_load
+from loadtest.stub_server import StubConfig, create_stub_app
+from main import app
+
+
+def test_percentile_interpolates():
+    """Test percentiles interpolate between samples."""
+    samples = [float(v) for v in range(1, 101)]
+    assert percentile(samples, 50) == pytest.approx(50.5)
+    assert percentile(samples, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+def test_stub_serves_configured_payload_and_errors():
+    """Test the stub mimics /data-range and injects errors."""
+    stub = TestClient(create_stub_app(StubConfig(records_per_day=10)))
+    response = stub.get("/data-range", params={"start": "2024-10-23", "days": 2})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert list(data) == ["2024-10-23", "2024-10-24"]
+    assert len(data["2024-10-23"]["records"]) == 10
+    
+    failing = TestClient(create_stub_app(StubConfig(error_rate=1.0)))
+    assert failing.get("/data", params={"date": "2024-10-23"}).status_code == 503
+
+
+async def test_run_load_reports_latency_percentiles():
+    """Test the load generator drives the API and summarizes the run."""
+    request = build_request("analyze-records", "2024-10-23", 2, records_per_day=4)
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        result = await run_load(client, request, rps=50, duration_s=0.2)
+    
+    summary = result.summary()
+    assert summary["requests"] == 10
+    assert summary["status_codes"] == {"200": 10}
+    assert summary["latency_ms"]["p50"] <= summary["latency_ms"]["p99"]
@@ -0,0 +1,27 @@
+"""Tests for airport regions and their pruning boxes"""
+import numpy as np
+from geopy.distance import geodesic
+
+from core.airports import MAJOR_AIRPORTS
+from services.regions import build_regions, catalog_regions
+
+
+def test_every_airport_belongs_to_one_region():
+    """Test the regions partition the catalog."""
+    regions = catalog_regions(160.9)
+    codes = [code for region in regions for code in region.codes]
+    assert sorted(codes) == sorted(MAJOR_AIRPORTS)
+    for region in regions:
+        assert [list(MAJOR_AIRPORTS)[c] for c in region.columns] == list(region.codes)
+
+
+def test_boxes_never_prune_positions_in_range():
+    """Test any position within the radius of an airport lies inside its region box."""
+    radius_km = 300.0
+    rng = np.random.default_rng(7)
+    for region in build_regions(MAJOR_AIRPORTS, radius_km):
+        for code in region.codes:
+            airport = (MAJOR_AIRPORTS[code]['lat'], MAJOR_AIRPORTS[code]['lon'])
+            for bearing in rng.uniform(0, 360, size=16):
+                point = geodesic(kilometers=radius_km * 0.999).destination(airport, bearing)
+                assert region.contains(np.array([point.latitude]), np.array([point.longitude]))[0]
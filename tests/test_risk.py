@@ -242,3 +242,196 @@ def test_analyze_risk_negative_days(client):
     )
     assert response.status_code == 422
 
+
+def test_analyze_records_conditional_request(client, mock_hurricane_data_range):
+    """Test analyze-records returns an ETag and honours If-None-Match."""
+    body = {
+        "start_date": "2024-10-23",
+        "days": 3,
+        "data": mock_hurricane_data_range["data"]
+    }
+    
+    first = client.post("/api/v1/analyze-records", json=body)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+    assert "hit_rate" in first.json()["meta"]["metrics"]["distance_memo"]
+    
+    # Same inputs with a different analysis_timestamp still revalidate
+    second = client.post("/api/v1/analyze-records", json=body, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    
+    # Changed records produce a new ETag and a full response
+    body["data"]["2024-10-25"]["records"] = [
+        {"track_id": "AL182024", "valid_time": "2024-10-25T00:00:00Z", "lat": 28.4, "lon": -81.3}
+    ]
+    third = client.post("/api/v1/analyze-records", json=body, headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+
+
+def test_analyze_records_invalid_resolution(client):
+    """Test analyze-records rejects window sizes that do not divide a day."""
+    response = client.post(
+        "/api/v1/analyze-records",
+        json={"start_date": "2024-10-23", "days": 1, "data": {}, "resolution_hours": 5}
+    )
+    assert response.status_code == 422
+
+
+def test_analyze_records_reuses_cached_result(client, mock_hurricane_data_range, mock_risk_profile_result):
+    """Test identical inputs are served from the result cache without recomputing."""
+    body = {"start_date": "2024-10-23", "days": 1, "data": mock_hurricane_data_range["data"]}
+    
+    with patch('routers.risk.RiskCalculator') as mock_calc_class:
+        mock_calc_instance = mock_calc_class.return_value
+        mock_calc_instance.calculate_risk_profile.return_value = mock_risk_profile_result
+        
+        first = client.post("/api/v1/analyze-records", json=body)
+        second = client.post("/api/v1/analyze-records", json=body)
+        
+        assert first.status_code == second.status_code == 200
+        assert first.json()["daily_risk"] == second.json()["daily_risk"]
+        mock_calc_instance.calculate_risk_profile.assert_called_once()
+
+
+def test_analyze_records_invalid_breakpoints(client):
+    """Test analyze-records rejects breakpoints that are not [high, medium] ascending."""
+    response = client.post(
+        "/api/v1/analyze-records",
+        json={"start_date": "2024-10-23", "days": 1, "data": {}, "risk_breakpoints_km": [100, 50]}
+    )
+    assert response.status_code == 422
+
+
+def test_analyze_records_delta_against_previous_token(client, mock_hurricane_data_range):
+    """Test previous_token returns only per-day airport changes."""
+    body = {"start_date": "2024-10-23", "days": 3, "data": mock_hurricane_data_range["data"]}
+    first = client.post("/api/v1/analyze-records", json=body).json()
+    token = first["meta"]["result_token"]
+    
+    # Next forecast cycle: day 3 gains a storm over JFK, days 1-2 unchanged
+    body["data"]["2024-10-25"]["records"] = [
+        {"track_id": "AL182024", "valid_time": "2024-10-25T00:00:00Z", "lat": 40.64, "lon": -73.78}
+    ]
+    body["previous_token"] = token
+    response = client.post("/api/v1/analyze-records", json=body)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["daily_risk"] == []
+    assert data["meta"]["delta"] == {"base_token": token, "status": "applied", "days_changed": 1}
+    assert [d["date"] for d in data["daily_delta"]] == ["2024-10-25"]
+    assert "JFK" in {a["airport_code"] for a in data["daily_delta"][0]["added"]}
+    assert data["daily_delta"][0]["removed"] == []
+    
+    # Unknown tokens fall back to the full result
+    body["previous_token"] = "unknown"
+    fallback = client.post("/api/v1/analyze-records", json=body).json()
+    assert fallback["meta"]["delta"]["status"] == "unavailable"
+    assert len(fallback["daily_risk"]) == 3
+
+
+def test_analyze_records_profiling_requires_configured_token(client, mock_hurricane_data_range, tmp_path, monkeypatch):
+    """Test a profiled request reports stage timings and a downloadable pstats file."""
+    import pstats
+    from core.config import settings
+    
+    body = {"start_date": "2024-10-23", "days": 2, "data": mock_hurricane_data_range["data"]}
+    headers = {"X-Profile-Token": "secret"}
+    
+    # Off unless the operator configured a token
+    plain = client.post("/api/v1/analyze-records", json=body, headers=headers)
+    assert "profile" not in plain.json()["meta"]
+    
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    assert "profile" not in client.post(
+        "/api/v1/analyze-records", json=body, headers={"X-Profile-Token": "wrong"}
+    ).json()["meta"]
+    
+    # Profiled requests recompute even when the result is cached
+    profiled = client.post("/api/v1/analyze-records", json=body, headers=headers)
+    assert profiled.status_code == 200
+    assert profiled.headers["cache-control"] == "no-store"
+    profile = profiled.json()["meta"]["profile"]
+    assert profile["stages"]["distances"]["calls"] == 2
+    assert {"calculate", "parse", "exposure"} <= set(profile["stages"])
+    # Stages nest on the worker thread, so the outer stage's CPU covers the inner ones
+    stages = profile["stages"]
+    assert stages["calculate"]["cpu_ms"] >= stages["distances"]["cpu_ms"] + stages["parse"]["cpu_ms"] - 0.01
+    assert profiled.json()["daily_risk"] == plain.json()["daily_risk"]
+    
+    download = client.get(f"/api/v1/profiles/{profile['profile_id']}", headers=headers)
+    assert download.status_code == 200
+    path = tmp_path / "downloaded.pstats"
+    path.write_bytes(download.content)
+    assert pstats.Stats(str(path)).total_calls > 0
+    assert client.get(f"/api/v1/profiles/{profile['profile_id']}").status_code == 404
+
+
+def test_analyze_records_keeps_null_storm_fields(client):
+    """Test nullable fields are returned as null while unrequested sections stay omitted."""
+    record = {"valid_time": "2024-10-23T02:00:00Z", "lat": 25.79, "lon": -80.29}
+    body = {
+        "start_date": "2024-10-23",
+        "days": 1,
+        "include_storm_breakdown": True,
+        "data": {"2024-10-23": {"records": [record]}}
+    }
+    
+    response = client.post("/api/v1/analyze-records", json=body)
+    
+    assert response.status_code == 200
+    day = response.json()["daily_risk"][0]
+    assert day["storms"][0]["track_id"] is None
+    assert day["storms"][0]["closest_airport"] == "MIA"
+    assert "time_windows" not in day and "exposure_by_radius" not in day
+    assert "daily_delta" not in response.json()
+
+
+def test_analyze_records_numeric_track_id(client):
+    """Test numeric track_ids are returned as strings in the storm breakdown."""
+    record = {"track_id": 18, "valid_time": "2024-10-23T02:00:00Z", "lat": 25.79, "lon": -80.29}
+    body = {
+        "start_date": "2024-10-23",
+        "days": 1,
+        "include_storm_breakdown": True,
+        "data": {"2024-10-23": {"records": [record]}}
+    }
+    
+    response = client.post("/api/v1/analyze-records", json=body)
+    
+    assert response.status_code == 200
+    assert response.json()["daily_risk"][0]["storms"][0]["track_id"] == "18"
+
+
+def test_analyze_records_hashes_and_counts_off_the_event_loop(client, mock_hurricane_data_range, monkeypatch):
+    """Test ETag hashing and record counting run in the threadpool."""
+    import asyncio
+    import routers.risk as risk_module
+    
+    on_loop = []
+    
+    def recording(func):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(func.__name__)
+            except RuntimeError:
+                pass
+            return func(*args, **kwargs)
+        return wrapper
+    
+    monkeypatch.setattr(risk_module, "compute_etag", recording(risk_module.compute_etag))
+    monkeypatch.setattr(risk_module, "_count_records", recording(risk_module._count_records))
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        json={"start_date": "2024-10-23", "days": 3, "data": mock_hurricane_data_range["data"]}
+    )
+    
+    assert response.status_code == 200
+    assert on_loop == []
@@ -0,0 +1,212 @@
+"""Tests for the risk calculation service"""
+import pandas as pd
+import pytest
+
+from services.risk_calculator import RiskCalculator, HOURLY_TRAFFIC_SHARES
+
+
+def _record(valid_time, lat=25.79, lon=-80.29, track_id="AL182024"):
+    """Hurricane record positioned on top of MIA by default."""
+    return {
+        "track_id": track_id,
+        "valid_time": valid_time,
+        "lat": lat,
+        "lon": lon,
+        "maximum_sustained_wind_speed_knots": 85
+    }
+
+
+@pytest.fixture
+def calculator():
+    """Risk calculator using the default airport catalog."""
+    return RiskCalculator()
+
+
+def test_daily_profile_flags_nearby_airports(calculator):
+    """Test airports within the risk radius are reported with travelers and risk level."""
+    data = {"data": {"2024-10-23": {"records": [_record("2024-10-23T02:00:00Z")]}}}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 1)
+    
+    day = result["daily_risk"][0]
+    codes = [airport["airport_code"] for airport in day["airports_at_risk"]]
+    assert "MIA" in codes and "FLL" in codes
+    assert "ATL" not in codes
+    mia = next(a for a in day["airports_at_risk"] if a["airport_code"] == "MIA")
+    assert mia["risk_level"] == "high"
+    assert mia["travelers_at_risk"] == calculator.calculate_daily_travelers("MIA", pd.Timestamp("2024-10-23"))
+    assert "time_windows" not in day
+
+
+def test_hourly_shares_sum_to_one():
+    """Test the interpolated hourly traffic curve is a distribution over 24 hours."""
+    assert len(HOURLY_TRAFFIC_SHARES) == 24
+    assert HOURLY_TRAFFIC_SHARES.sum() == pytest.approx(1.0)
+
+
+def test_sub_daily_windows_separate_storm_timing(calculator):
+    """Test 6-hourly windows place early and late passes in different windows."""
+    data = {"data": {"2024-10-23": {"records": [
+        _record("2024-10-23T22:00:00Z"),
+        _record("2024-10-23T02:00:00Z"),
+        _record("not-a-time"),
+    ]}}}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 1, resolution_hours=6)
+    
+    windows = result["daily_risk"][0]["time_windows"]
+    assert [w["window_start"] for w in windows] == [
+        "2024-10-23T00:00:00Z", "2024-10-23T06:00:00Z",
+        "2024-10-23T12:00:00Z", "2024-10-23T18:00:00Z"
+    ]
+    assert [w["active_hurricanes"] for w in windows] == [1, 0, 0, 1]
+    assert windows[1]["airports_affected"] == 0
+    # Window travelers follow the diurnal curve, so night windows see fewer travelers
+    daily_mia = next(a for a in result["daily_risk"][0]["airports_at_risk"] if a["airport_code"] == "MIA")
+    night_mia = next(a for a in windows[0]["airports_at_risk"] if a["airport_code"] == "MIA")
+    assert night_mia["travelers_at_risk"] < daily_mia["travelers_at_risk"] / 4
+
+
+def test_invalid_resolution_rejected(calculator):
+    """Test unsupported window sizes raise ValueError."""
+    with pytest.raises(ValueError):
+        calculator.calculate_risk_profile({"data": {}}, "2024-10-23", 1, resolution_hours=5)
+
+
+def test_multi_radius_exposure_from_one_pass(calculator):
+    """Test every requested radius is reported and nested within larger ones."""
+    data = {"data": {"2024-10-23": {"records": [_record("2024-10-23T02:00:00Z")]}}}
+    
+    result = calculator.calculate_risk_profile(
+        data, "2024-10-23", 1, radii_km=[300, 50, 100, 160.9]
+    )
+    
+    day = result["daily_risk"][0]
+    exposures = day["exposure_by_radius"]
+    assert [e["radius_km"] for e in exposures] == [50, 100, 160.9, 300]
+    codes = [{a["airport_code"] for a in e["airports_at_risk"]} for e in exposures]
+    assert codes[0] <= codes[1] <= codes[2] <= codes[3]
+    assert codes[2] == {a["airport_code"] for a in day["airports_at_risk"]}
+    assert exposures[2]["total_travelers_at_risk"] == day["total_travelers_at_risk"]
+    assert all(a["distance_to_hurricane_km"] <= 50 for a in exposures[0]["airports_at_risk"])
+    assert len(codes[3]) > len(codes[2])
+    # Distances for all radii come from a single memo lookup per position and region
+    regions = result["metrics"]["regions"]
+    assert result["metrics"]["distance_memo"]["positions"] == sum(r["evaluated"] for r in regions.values())
+
+
+def test_custom_risk_breakpoints(calculator):
+    """Test risk levels follow caller-provided breakpoints."""
+    data = {"data": {"2024-10-23": {"records": [_record("2024-10-23T02:00:00Z")]}}}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 1, risk_breakpoints_km=[1, 2])
+    
+    levels = {a["airport_code"]: a["risk_level"] for a in result["daily_risk"][0]["airports_at_risk"]}
+    assert levels["MIA"] == "high"
+    assert levels["FLL"] == "low"
+
+
+def test_storm_breakdown_groups_positions_by_track(calculator):
+    """Test per-storm exposure and that active_hurricanes counts distinct storms."""
+    data = {"data": {"2024-10-23": {"records": [
+        _record("2024-10-23T00:00:00Z"),
+        _record("2024-10-23T06:00:00Z", lat=25.9),
+        _record("2024-10-23T00:00:00Z", lat=40.64, lon=-73.78, track_id="AL192024"),
+    ]}}}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 1, storm_breakdown=True)
+    
+    day = result["daily_risk"][0]
+    assert day["active_hurricanes"] == 2
+    storms = {storm["track_id"]: storm for storm in day["storms"]}
+    assert storms["AL182024"]["closest_airport"] == "MIA"
+    assert "MIA" in storms["AL182024"]["airport_codes"]
+    assert "MIA" not in storms["AL192024"]["airport_codes"]
+    assert storms["AL192024"]["closest_airport"] == "JFK"
+    assert storms["AL182024"]["closest_approach_km"] < 1
+    primary = {a["airport_code"] for a in day["airports_at_risk"]}
+    assert set(storms["AL182024"]["airport_codes"]) | set(storms["AL192024"]["airport_codes"]) == primary
+    
+    plain = calculator.calculate_risk_profile(data, "2024-10-23", 1)
+    assert "storms" not in plain["daily_risk"][0]
+
+
+def test_regions_outside_storm_boxes_are_skipped(calculator):
+    """Test pruned regions are skipped without changing the exposure result."""
+    data = {"data": {"2024-10-23": {"records": [_record("2024-10-23T02:00:00Z")]}}}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 1, storm_breakdown=True)
+    
+    regions = result["metrics"]["regions"]
+    assert regions["florida"]["evaluated"] == 1
+    assert regions["bermuda"]["skipped"] == 1
+    assert regions["central_america"]["skipped"] == 1
+    
+    # Same airports and distances as an exhaustive scan
+    exhaustive = {
+        code: calculator.distance_memo._compute((25.79, -80.29))[column]
+        for column, code in enumerate(calculator.airport_data['airport_code'])
+    }
+    day = result["daily_risk"][0]
+    expected = {code for code, km in exhaustive.items() if km <= calculator.risk_radius_km}
+    assert {a["airport_code"] for a in day["airports_at_risk"]} == expected
+    
+    # A storm far from every region still reports its true closest airport
+    far = {"data": {"2024-10-23": {"records": [_record("2024-10-23T02:00:00Z", lat=45.0, lon=-30.0)]}}}
+    storm = calculator.calculate_risk_profile(far, "2024-10-23", 1, storm_breakdown=True)["daily_risk"][0]["storms"][0]
+    assert storm["closest_airport"] is not None and storm["total_travelers_at_risk"] == 0
+
+
+def test_storm_closest_approach_in_pruned_region(calculator):
+    """Test closest approach is exact when the nearest airport's region was pruned."""
+    # East of Boston: outside the us_east box at the default radius, but BOS
+    # is still the nearest airport of all
+    data = {"data": {"2024-10-23": {"records": [
+        _record("2024-10-23T02:00:00Z", lat=42.36, lon=-68.0, track_id="AL2"),
+        _record("2024-10-23T02:00:00Z", lat=25.0, lon=-77.5, track_id="AL1"),
+    ]}}}
+    positions = [(42.36, -68.0)]
+    exhaustive = calculator.distance_memo._compute(calculator.distance_memo._point(
+        calculator.distance_memo._key(*positions[0])
+    ))
+    
+    def al2(radii_km=None):
+        result = calculator.calculate_risk_profile(
+            data, "2024-10-23", 1, storm_breakdown=True, radii_km=radii_km
+        )
+        assert result["metrics"]["regions"]["us_east"]["skipped"] == (0 if radii_km else 1)
+        return next(s for s in result["daily_risk"][0]["storms"] if s["track_id"] == "AL2")
+    
+    storm = al2()
+    assert storm["closest_airport"] == "BOS"
+    assert storm["closest_approach_km"] == round(float(exhaustive.min()), 2)
+    assert al2(radii_km=[50, 300]) == storm
+
+
+def test_region_counts_are_per_day(calculator):
+    """Test region metrics count one pass per day, not per sub-daily window."""
+    data = {"data": {
+        "2024-10-23": {"records": [_record("2024-10-23T02:00:00Z"), _record("2024-10-23T14:00:00Z")]},
+        "2024-10-25": {"records": [_record("2024-10-25T08:00:00Z")]},
+    }}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 5, resolution_hours=6)
+    
+    regions = result["metrics"]["regions"]
+    assert all(r["evaluated"] + r["skipped"] == 5 for r in regions.values())
+    assert regions["florida"]["evaluated"] == 2
+
+
+def test_track_ids_are_normalized_to_strings(calculator):
+    """Test numeric and non-hashable track_ids group as strings."""
+    data = {"data": {"2024-10-23": {"records": [
+        _record("2024-10-23T00:00:00Z", track_id=18),
+        _record("2024-10-23T06:00:00Z", track_id=18),
+        _record("2024-10-23T00:00:00Z", lat=40.64, lon=-73.78, track_id=["AL", 19]),
+    ]}}}
+    
+    result = calculator.calculate_risk_profile(data, "2024-10-23", 1, storm_breakdown=True)
+    
+    day = result["daily_risk"][0]
+    assert day["active_hurricanes"] == 2
+    assert {storm["track_id"] for storm in day["storms"]} == {"18", "['AL', 19]"}
@@ -0,0 +1,87 @@
+"""Tests for server-push risk subscriptions"""
+import asyncio
+
+import pytest
+
+from services.risk_calculator import RiskCalculator
+from services.subscriptions import SubscriptionHub, SubscriptionLimitReached, subscription_hub
+
+
+def _records(lat, lon):
+    return {"records": [{"track_id": "AL182024", "valid_time": "2024-10-23T00:00:00Z", "lat": lat, "lon": lon}]}
+
+
+async def test_hub_computes_once_and_pushes_only_changed_days():
+    """Test subscribers of one window share a computation and receive only changed days."""
+    upstream = {"data": {"2024-10-23": _records(25.79, -80.29), "2024-10-24": {"records": []}}}
+    computations = []
+    
+    async def fetch(start_date, days):
+        return upstream
+    
+    def calculator_factory():
+        computations.append(1)
+        return RiskCalculator()
+    
+    hub = SubscriptionHub(fetch=fetch, poll_interval=3600, calculator_factory=calculator_factory)
+    key, first = hub.subscribe("2024-10-23", 2)
+    _, second = hub.subscribe("2024-10-23", 2, airports={"MIA"})
+    state = hub.windows[key]
+    
+    await hub.refresh(key, state)
+    assert len(computations) == 1
+    assert first.queue.qsize() == 2
+    assert second.queue.qsize() == 2
+    
+    # Unchanged upstream data: no recomputation, nothing pushed
+    await hub.refresh(key, state)
+    assert len(computations) == 1
+    
+    # A storm appears near JFK on the second day only
+    while not first.queue.empty():
+        first.queue.get_nowait()
+    while not second.queue.empty():
+        second.queue.get_nowait()
+    upstream["data"]["2024-10-24"] = _records(40.64, -73.78)
+    changed = await hub.refresh(key, state)
+    
+    assert len(computations) == 2
+    assert [profile["date"] for profile in changed] == ["2024-10-24"]
+    assert first.queue.get_nowait()["airports_affected"] > 0
+    # The MIA-only subscriber sees the new storm but no affected airports
+    filtered = second.queue.get_nowait()
+    assert filtered["active_hurricanes"] == 1
+    assert filtered["airports_affected"] == 0
+    
+    hub.unsubscribe(key, first)
+    hub.unsubscribe(key, second)
+    assert key not in hub.windows
+    await asyncio.sleep(0)
+    await hub.close()
+
+
+async def test_hub_caps_distinct_windows():
+    """Test new windows beyond max_windows are refused while existing ones can be joined."""
+    async def fetch(start_date, days):
+        return {"data": {}}
+    
+    hub = SubscriptionHub(fetch=fetch, poll_interval=3600, max_windows=1)
+    key, first = hub.subscribe("2024-10-23", 2)
+    _, second = hub.subscribe("2024-10-23", 2)
+    with pytest.raises(SubscriptionLimitReached):
+        hub.subscribe("2024-10-24", 2)
+    
+    hub.unsubscribe(key, first)
+    hub.unsubscribe(key, second)
+    other_key, other = hub.subscribe("2024-10-24", 2)
+    hub.unsubscribe(other_key, other)
+    await asyncio.sleep(0)
+    await hub.close()
+
+
+def test_subscribe_rejects_invalid_start_date(client):
+    """Test a malformed start_date fails fast instead of starting a poller."""
+    response = client.get("/api/v1/subscribe", params={"start_date": "2024-13-45", "days": 2})
+    
+    assert response.status_code == 422
+    assert not subscription_hub.windows
@@ -0,0 +1,66 @@
+"""Tests for the traveler volume model"""
+import json
+
+import pandas as pd
+
+from core.airports import MAJOR_AIRPORTS
+from services.traveler_model import TravelCalendar, TravelerVolumeModel
+
+
+def _reference_travelers(baseline, date):
+    """Month and weekday seasonality as originally specified."""
+    if date.month in [3, 4, 5, 6, 7, 8]:
+        multiplier = 1.2
+    elif date.month in [11, 12, 1]:
+        multiplier = 1.1
+    else:
+        multiplier = 1.0
+    dow = date.weekday()
+    if dow in [4, 5, 6]:
+        dow_multiplier = 1.2
+    elif dow in [0, 1]:
+        dow_multiplier = 0.9
+    else:
+        dow_multiplier = 1.0
+    return int(max(0, baseline * multiplier * dow_multiplier))
+
+
+def test_matrix_matches_month_and_weekday_seasonality():
+    """Test the vectorized matrix reproduces the per-airport seasonality rules."""
+    model = TravelerVolumeModel(MAJOR_AIRPORTS)
+    matrix = model.volume_matrix("2024-01-01", 366)
+    
+    assert matrix.shape == (366, len(MAJOR_AIRPORTS))
+    for day, date in enumerate(pd.date_range("2024-01-01", periods=366)):
+        for code in ("ATL", "MIA", "EYW"):
+            expected = _reference_travelers(MAJOR_AIRPORTS[code]["daily_passengers"], date)
+            assert matrix[day, model.airport_index[code]] == expected
+
+
+def test_matrix_is_cached_per_window():
+    """Test repeated windows reuse the same read-only matrix."""
+    model = TravelerVolumeModel(MAJOR_AIRPORTS)
+    first = model.volume_matrix("2024-10-23", 7)
+    assert model.volume_matrix("2024-10-23", 7) is first
+    assert not first.flags.writeable
+    assert model.volume_matrix("2024-10-23", 8) is not first
+
+
+def test_calendar_file_applies_holidays_and_seasonal_curves(tmp_path):
+    """Test holiday multipliers and per-airport seasonal curves from a file."""
+    path = tmp_path / "calendar.json"
+    path.write_text(json.dumps({
+        "holidays": {"2024-10-24": 2.0},
+        "seasonal": {"MIA": [0.5] * 12}
+    }))
+    calendar = TravelCalendar.load(str(path))
+    base = TravelerVolumeModel(MAJOR_AIRPORTS).volume_matrix("2024-10-23", 2)
+    model = TravelerVolumeModel(MAJOR_AIRPORTS, calendar)
+    matrix = model.volume_matrix("2024-10-23", 2)
+    
+    atl, mia = model.airport_index["ATL"], model.airport_index["MIA"]
+    assert matrix[0, atl] == base[0, atl]
+    assert matrix[1, atl] == base[1, atl] * 2
+    # Wednesday, MIA seasonal 0.5 instead of the October base of 1.0
+    assert matrix[0, mia] == 25000
+    assert calendar.version != "default"
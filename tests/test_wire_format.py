@@ -0,0 +1,181 @@
+"""Tests for wire format negotiation and compression"""
+import gzip
+import json
+
+import pytest
+
+from services.wire_format import (
+    CBOR, JSON, MSGPACK, WireFormatError, decompress, negotiate_encoding, negotiate_format
+)
+
+
+def _body(mock_hurricane_data_range, days=3):
+    return {"start_date": "2024-10-23", "days": days, "data": mock_hurricane_data_range["data"]}
+
+
+def test_gzip_request_and_response(client, mock_hurricane_data_range):
+    """Test gzip request bodies are accepted and large responses are compressed."""
+    payload = gzip.compress(json.dumps(_body(mock_hurricane_data_range)).encode())
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        content=payload,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip", "Accept-Encoding": "gzip"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.headers["etag"].startswith('W/"')
+    assert len(response.json()["daily_risk"]) == 3
+    
+    # Weak ETags still revalidate
+    again = client.post(
+        "/api/v1/analyze-records",
+        content=payload,
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip",
+                 "Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    )
+    assert again.status_code == 304
+
+
+def test_identity_response_without_accept_encoding(client, mock_hurricane_data_range):
+    """Test responses stay plain JSON with a strong ETag when nothing is negotiated."""
+    response = client.post(
+        "/api/v1/analyze-records",
+        json=_body(mock_hurricane_data_range),
+        headers={"Accept-Encoding": "identity"}
+    )
+    
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-type"] == JSON
+    assert response.headers["etag"].startswith('"')
+
+
+def test_small_responses_not_compressed(client):
+    """Test responses below the threshold are sent uncompressed."""
+    response = client.get("/api/v1/health", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_rejects_unsupported_or_oversized_bodies(client):
+    """Test unknown codings, corrupt data and decompression bombs are refused."""
+    headers = {"Content-Type": "application/json"}
+    
+    assert client.post("/api/v1/analyze-records", content=b"{}",
+                       headers={**headers, "Content-Encoding": "br"}).status_code == 415
+    assert client.post("/api/v1/analyze-records", content=b"not gzip",
+                       headers={**headers, "Content-Encoding": "gzip"}).status_code == 400
+    with pytest.raises(WireFormatError) as excinfo:
+        decompress(gzip.compress(b"0" * 10_000), "gzip", max_bytes=1000)
+    assert excinfo.value.status_code == 413
+
+
+def test_negotiation_follows_quality_values():
+    """Test Accept/Accept-Encoding parsing honours q-values and availability."""
+    assert negotiate_format(None) == JSON
+    assert negotiate_format("text/html, application/json;q=0.9") == JSON
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("br, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("*") in ("gzip", "zstd")
+
+
+def test_msgpack_round_trip(client, mock_hurricane_data_range):
+    """Test MessagePack request and response bodies carry the JSON schema."""
+    msgpack = pytest.importorskip("msgpack")
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        content=msgpack.packb(_body(mock_hurricane_data_range)),
+        headers={"Content-Type": MSGPACK, "Accept": MSGPACK}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK
+    document = msgpack.unpackb(response.content, raw=False)
+    assert len(document["daily_risk"]) == 3
+    assert "result_token" in document["meta"]
+
+
+def test_msgpack_binary_values_rejected(client):
+    """Test MessagePack values without a JSON equivalent get a 400, not a 500."""
+    msgpack = pytest.importorskip("msgpack")
+    body = {"start_date": "2024-10-23", "days": 1, "data": {}, "previous_token": b"\x00\x01"}
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        content=msgpack.packb(body, use_bin_type=True),
+        headers={"Content-Type": MSGPACK}
+    )
+    
+    assert response.status_code == 400
+    assert "bytes" in response.json()["detail"]
+
+
+def test_cbor_native_datetimes_accepted(client):
+    """Test CBOR tagged times decode to ISO strings for valid_time."""
+    cbor2 = pytest.importorskip("cbor2")
+    from datetime import datetime, timezone
+    record = {
+        "track_id": "AL182024",
+        "valid_time": datetime(2024, 10, 23, 2, tzinfo=timezone.utc),
+        "lat": 25.79,
+        "lon": -80.29,
+    }
+    body = {"start_date": "2024-10-23", "days": 1, "data": {"2024-10-23": {"records": [record]}}}
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        content=cbor2.dumps(body),
+        headers={"Content-Type": CBOR, "Accept": CBOR}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == CBOR
+    day = cbor2.loads(response.content)["daily_risk"][0]
+    assert "MIA" in [a["airport_code"] for a in day["airports_at_risk"]]
+    
+    # Binary values still have no JSON equivalent
+    assert client.post(
+        "/api/v1/analyze-records",
+        content=cbor2.dumps({**body, "previous_token": b"\x00"}),
+        headers={"Content-Type": CBOR}
+    ).status_code == 400
+
+
+def test_multi_member_and_truncated_bodies():
+    """Test every gzip member / zstd frame is decoded and truncated streams are refused."""
+    two_members = gzip.compress(b'{"a":') + gzip.compress(b'1}')
+    assert decompress(two_members, "gzip", max_bytes=1000) == b'{"a":1}'
+    with pytest.raises(WireFormatError) as excinfo:
+        decompress(gzip.compress(b"x" * 1000)[:-10], "gzip", max_bytes=10_000)
+    assert excinfo.value.status_code == 400
+    with pytest.raises(WireFormatError) as excinfo:
+        decompress(two_members, "gzip", max_bytes=6)
+    assert excinfo.value.status_code == 413
+    
+    zstandard = pytest.importorskip("zstandard")
+    compressor = zstandard.ZstdCompressor()
+    frames = compressor.compress(b'{"a":') + compressor.compress(b'1}')
+    assert decompress(frames, "zstd", max_bytes=1000) == b'{"a":1}'
+    with pytest.raises(WireFormatError) as excinfo:
+        decompress(compressor.compress(b"x" * 1000)[:-3], "zstd", max_bytes=10_000)
+    assert excinfo.value.status_code == 400
+
+
+def test_multi_member_gzip_request(client, mock_hurricane_data_range):
+    """Test a gzip body split across members reaches validation whole."""
+    payload = json.dumps(_body(mock_hurricane_data_range)).encode()
+    middle = len(payload) // 2
+    
+    response = client.post(
+        "/api/v1/analyze-records",
+        content=gzip.compress(payload[:middle]) + gzip.compress(payload[middle:]),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    )
+    
+    assert response.status_code == 200
+    assert len(response.json()["daily_risk"]) == 3